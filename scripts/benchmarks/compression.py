@@ -0,0 +1,67 @@
+"""
+Benchmark: size saved and CPU cost of each response encoding and level on a paginated list payload.
+
+Compares every encoding that is installed (gzip, brotli, zstd) at a few levels, to help pick the
+COMPRESSION_*_LEVEL settings.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:// python -m scripts.benchmarks.compression [--rows N] [--number N]
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+
+from src.api.middleware.compression import BrotliCompressor, GzipCompressor, ZstdCompressor, brotli, zstandard
+
+LEVELS = {"gzip": (GzipCompressor, [1, 6, 9])}
+if brotli is not None:
+    LEVELS["br"] = (BrotliCompressor, [1, 4, 6, 11])
+if zstandard is not None:
+    LEVELS["zstd"] = (ZstdCompressor, [1, 3, 9])
+
+
+def build_payload(rows: int) -> bytes:
+    now = datetime.now(timezone.utc).isoformat()
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Project {i}",
+            "description": "A project of the blueprint with a short description",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    return json.dumps({"items": items, "next_cursor": None}).encode()
+
+
+def compress(compressor_class: type, level: int, payload: bytes) -> bytes:
+    compressor = compressor_class(level)
+    return compressor.compress(payload) + compressor.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.rows)
+    print(f"Payload: {len(payload):,} bytes")
+    for encoding, (compressor_class, levels) in LEVELS.items():
+        for level in levels:
+            run = partial(compress, compressor_class, level, payload)
+            size = len(run())
+            seconds = min(timeit.repeat(run, number=args.number, repeat=3)) / args.number
+            print(
+                f"{encoding:>4} level {level:>2}: {size:>9,} bytes ({1 - size / len(payload):6.1%} saved)"
+                f"  {seconds * 1e6:>9.0f} µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
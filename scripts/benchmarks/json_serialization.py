@@ -0,0 +1,76 @@
+"""
+Benchmark: per-record (JSON log formatter) and per-response (default response class) encoding cost.
+
+Compares every JSON backend that is installed (stdlib, orjson, msgspec) on typical payloads.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:// python -m scripts.benchmarks.json_serialization [--number N]
+"""
+
+import argparse
+import logging
+import logging.config
+import timeit
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+
+from fastapi.encoders import jsonable_encoder
+
+from src.core.logging import get_logging_config
+from src.core.serialization import get_json_log_formatter, get_response_class, msgspec, orjson
+
+BACKENDS = ["stdlib"] + (["orjson"] if orjson else []) + (["msgspec"] if msgspec else [])
+
+SMALL_PAYLOAD = {"id": 1, "status": "ok"}
+LIST_PAYLOAD = jsonable_encoder(
+    [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Project {i}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            "budget": 12_345.67 + i,
+            "active": i % 2 == 0,
+            "tags": ["construction", "residential", "phase-1"],
+            "created_at": datetime.now(timezone.utc),
+        }
+        for i in range(100)
+    ]
+)
+
+
+def build_formatter(backend: str) -> logging.Formatter:
+    config = get_logging_config("json")["formatters"]["json"] | get_json_log_formatter(backend)
+    factory = logging.config.DictConfigurator({}).resolve(config.pop("()"))
+    return factory(**config)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    record = logging.LogRecord(
+        "api.requests",
+        logging.INFO,
+        __file__,
+        1,
+        "Response: %s %s Status: %s Took: %.4fs",
+        ("GET", "/v1/x", 200, 0.01),
+        None,
+    )
+
+    print(f"{'backend':<10}{'log record':>14}{'small response':>18}{'100-item response':>20}")
+    for backend in BACKENDS:
+        formatter = build_formatter(backend)
+        response_class = get_response_class(backend)
+
+        n = args.number
+        per_record = timeit.timeit(partial(formatter.format, record), number=n) / n
+        per_small = timeit.timeit(partial(response_class, SMALL_PAYLOAD), number=n) / n
+        per_list = timeit.timeit(partial(response_class, LIST_PAYLOAD), number=n // 10) / (n // 10)
+        print(f"{backend:<10}{per_record * 1e6:>11.2f} µs{per_small * 1e6:>15.2f} µs{per_list * 1e6:>17.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
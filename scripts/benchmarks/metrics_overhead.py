@@ -0,0 +1,56 @@
+"""
+Benchmark: per-request cost of MetricsMiddleware on /v1/healthz.
+
+Drives the ASGI app in-process (no socket, no server) with and without the middleware
+and reports the difference in microseconds per request (target: well under 20 µs).
+
+Usage:
+    python -m scripts.benchmarks.metrics_overhead [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from scripts.benchmarks.middleware_throughput import call
+from src.api import v1 as api_v1
+from src.api.middleware.metrics import MetricsMiddleware
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    api_v1.add_routes(app)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    for _ in range(200):  # warm-up
+        await call(app)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    plain, metered = build_app(with_metrics=False), build_app(with_metrics=True)
+    # Best of several rounds, to keep noise out of a difference of a few microseconds
+    before = min(asyncio.run(run(plain, args.requests)) for _ in range(args.rounds))
+    after = min(asyncio.run(run(metered, args.requests)) for _ in range(args.rounds))
+
+    print(f"Without metrics: {before * 1e6:8.1f} µs/request")
+    print(f"With metrics:    {after * 1e6:8.1f} µs/request  (+{(after - before) * 1e6:.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: requests/sec on /v1/healthz with BaseHTTPMiddleware vs pure ASGI middlewares.
+
+Drives the ASGI app in-process (no socket, no server) so the numbers isolate the
+middleware stack overhead.
+
+Usage:
+    python -m scripts.benchmarks.middleware_throughput [--requests N]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from src.api import v1 as api_v1
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.api.middleware.request_logging import RequestLoggingMiddleware
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    """Equivalent of the previous ``BaseHTTPMiddleware`` based implementation."""
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            raise
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Equivalent of the previous ``BaseHTTPMiddleware`` based implementation."""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        logging.getLogger("api.requests").info(
+            f"Request: {request.method} {request.url.path} from {request.client.host}"
+        )
+        response = await call_next(request)
+        logging.getLogger("api.requests").info(
+            f"Response: {request.method} {request.url.path} Status: {response.status_code} "
+            f"Took: {time.time() - start_time:.4f}s"
+        )
+        return response
+
+
+def build_app(error_middleware: type, logging_middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(error_middleware)
+    app.add_middleware(logging_middleware)
+    api_v1.add_routes(app)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/v1/healthz",
+        "raw_path": b"/v1/healthz",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    for _ in range(200):  # warm-up
+        await call(app)
+
+    start = time.perf_counter()
+    for _ in range(requests // concurrency):
+        await asyncio.gather(*(call(app) for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Keep the log calls (they are part of the cost) but do not write them anywhere.
+    requests_logger = logging.getLogger("api.requests")
+    requests_logger.handlers = [logging.NullHandler()]
+    requests_logger.setLevel(logging.INFO)
+    requests_logger.propagate = False
+
+    legacy = build_app(LegacyErrorHandlingMiddleware, LegacyRequestLoggingMiddleware)
+    asgi = build_app(ErrorHandlingMiddleware, RequestLoggingMiddleware)
+
+    before = asyncio.run(run(legacy, args.requests, args.concurrency))
+    after = asyncio.run(run(asgi, args.requests, args.concurrency))
+
+    print(f"BaseHTTPMiddleware: {before:10.0f} req/s")
+    print(f"Pure ASGI:          {after:10.0f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: event-loop latency while concurrent logins verify bcrypt passwords.
+
+A probe task sleeps for 5 ms in a loop and records how late it wakes up, which is the delay every other
+request on the worker would see. Logins call either the blocking `verify_password` or `averify_password`,
+which runs bcrypt on the bounded password thread pool (PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_PENDING).
+
+Usage:
+    python -m scripts.benchmarks.password_hashing [--logins N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.core.config import settings
+from src.core.security import averify_password, get_password_hash, verify_password
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def blocking_login(hashed: str) -> None:
+    verify_password("s3cret", hashed)
+
+
+async def async_login(hashed: str) -> None:
+    await averify_password("s3cret", hashed)
+
+
+async def run(login, hashed: str, logins: int) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    return elapsed, lags
+
+
+def report(name: str, elapsed: float, lags: list[float]) -> None:
+    q = statistics.quantiles(lags, n=100, method="inclusive") if len(lags) > 1 else lags * 99
+    print(f"{name:<22}{elapsed:>9.2f} s{q[49] * 1e3:>11.1f} ms{q[98] * 1e3:>11.1f} ms{max(lags) * 1e3:>11.1f} ms")
+
+
+async def main(logins: int) -> None:
+    hashed = get_password_hash("s3cret")
+    print(f"workers={settings.PASSWORD_HASH_WORKERS} max_pending={settings.PASSWORD_HASH_MAX_PENDING} logins={logins}")
+    print(f"{'':<22}{'total':>11}{'lag p50':>14}{'lag p99':>14}{'lag max':>14}")
+    report("verify_password", *await run(blocking_login, hashed, logins))
+    report("averify_password", *await run(async_login, hashed, logins))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
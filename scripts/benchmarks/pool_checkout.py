@@ -0,0 +1,60 @@
+"""
+Benchmark: connection checkout latency of the configured pool at different concurrency levels.
+
+Each task checks out a connection, runs `SELECT 1` and returns it. Checkout latency is the time
+spent waiting for `engine.connect()`, which is where an undersized pool (or a pre-ping round trip) shows up.
+Pool settings come from the DB_* environment variables (see `Settings`).
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.benchmarks.pool_checkout \
+        [--concurrency 1 8 32 128] [--iterations N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.db.session import build_engine
+
+
+async def worker(engine: AsyncEngine, iterations: int, samples: list[float]) -> None:
+    for _ in range(iterations):
+        start = time.perf_counter()
+        async with engine.connect() as conn:
+            samples.append(time.perf_counter() - start)
+            await conn.execute(sa.text("SELECT 1"))
+
+
+async def main(concurrency_levels: list[int], iterations: int) -> None:
+    engine = build_engine(settings.DATABASE_URL)
+    print(
+        f"pool_size={settings.DB_POOL_SIZE} max_overflow={settings.DB_MAX_OVERFLOW} "
+        f"pre_ping={settings.DB_POOL_PRE_PING} idle_threshold={settings.DB_POOL_PRE_PING_IDLE_SECONDS}s "
+        f"pgbouncer={settings.DB_PGBOUNCER_MODE}"
+    )
+    print(f"{'concurrency':>12}{'p50':>12}{'p95':>12}{'p99':>12}{'max':>12}")
+
+    await worker(engine, 10, [])  # warm-up: open the initial connections
+    for concurrency in concurrency_levels:
+        samples: list[float] = []
+        await asyncio.gather(*(worker(engine, iterations, samples) for _ in range(concurrency)))
+        q = statistics.quantiles(samples, n=100, method="inclusive")
+        print(
+            f"{concurrency:>12}{q[49] * 1e3:>9.3f} ms{q[94] * 1e3:>9.3f} ms"
+            f"{q[98] * 1e3:>9.3f} ms{max(samples) * 1e3:>9.3f} ms"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.iterations))
@@ -0,0 +1,225 @@
+# app/api/caching.py
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Protocol
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.responses import StreamingResponse
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover
+    redis_asyncio = None
+
+
+class CacheBackend(Protocol):
+    """Storage for cached responses. Tag versions are bumped to invalidate every entry stored under a tag."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def get_version(self, tag: str) -> int: ...
+
+    async def bump_version(self, tag: str) -> None: ...
+
+
+class InMemoryCacheBackend:
+    """Per-process LRU backend with a TTL per entry."""
+
+    def __init__(self, max_entries: int):
+        self.entries: TTLCache[str, bytes] = TTLCache(maxsize=max_entries, ttl=float("inf"))
+        self.versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, expires_at=time.time() + ttl)
+
+    async def get_version(self, tag: str) -> int:
+        return self.versions.get(tag, 0)
+
+    async def bump_version(self, tag: str) -> None:
+        self.versions[tag] = self.versions.get(tag, 0) + 1
+
+
+class RedisCacheBackend:
+    """
+    Backend shared by every worker, for a `redis.asyncio.Redis` compatible client
+    (anything with async `get`, `set(..., ex=)` and `incr`).
+    """
+
+    def __init__(self, client: Any, prefix: str = "response-cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(f"{self.prefix}{key}")
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(f"{self.prefix}{key}", value, ex=max(1, int(ttl)))
+
+    async def get_version(self, tag: str) -> int:
+        return int(await self.client.get(f"{self.prefix}tag:{tag}") or 0)
+
+    async def bump_version(self, tag: str) -> None:
+        await self.client.incr(f"{self.prefix}tag:{tag}")
+
+
+def build_cache_backend() -> CacheBackend:
+    """Creates the backend selected by RESPONSE_CACHE_BACKEND."""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if redis_asyncio is None:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND is 'redis' but the `redis` package is not installed")
+        return RedisCacheBackend(redis_asyncio.from_url(settings.REDIS_URL))
+    return InMemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float
+    vary: tuple[str, ...] = ()
+    per_user: bool = False
+    tags: tuple[str, ...] = ()
+    cache_control: Optional[str] = None
+
+    @property
+    def cache_control_header(self) -> str:
+        if self.cache_control is not None:
+            return self.cache_control
+        return f"{'private' if self.per_user else 'public'}, max-age={int(self.ttl)}"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    etag: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def dumps(self) -> bytes:
+        return json.dumps([self.status_code, self.headers]).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        meta, body = data.split(b"\n", 1)
+        status_code, headers = json.loads(meta)
+        return cls(status_code, [tuple(header) for header in headers], body)
+
+
+class ResponseCache:
+    """
+    Caches rendered GET responses. The key is built from the path, the sorted query string, the `vary` headers,
+    the caller's Authorization header for per-user entries and the current versions of the entry's tags,
+    so `invalidate(tag)` makes every entry stored under that tag unreachable at once.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def key_for(self, request: Request, policy: CachePolicy) -> str:
+        versions = [await self.backend.get_version(tag) for tag in policy.tags]
+        vary = [request.headers.get(name, "") for name in policy.vary]
+        user = request.headers.get("authorization", "") if policy.per_user else ""
+        parts = [request.url.path, sorted(request.query_params.multi_items()), vary, user, versions]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        data = await self.backend.get(key)
+        return CachedResponse.loads(data) if data is not None else None
+
+    async def set(self, key: str, response: CachedResponse, ttl: float) -> None:
+        await self.backend.set(key, response.dumps(), ttl)
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drops every response cached under any of `tags`, e.g. a table name after a write."""
+        for tag in tags:
+            await self.backend.bump_version(tag)
+
+
+response_cache = ResponseCache(build_cache_backend())
+
+
+def cache_response(
+    ttl: float = 60,
+    *,
+    vary: tuple[str, ...] = (),
+    per_user: bool = False,
+    tags: tuple[str, ...] = (),
+    cache_control: Optional[str] = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Caches the responses of a GET endpoint for `ttl` seconds. The endpoint's router must use `CachedRoute`.
+    vary lists the request headers that change the response, per_user keys entries by the Authorization header
+    and tags name the invalidation groups (CRUD writes invalidate their table name).
+    Responses carry a strong ETag and a Cache-Control header (private for per_user entries), and requests
+    with a matching If-None-Match get a 304.
+    """
+    policy = CachePolicy(
+        ttl=ttl, vary=tuple(h.lower() for h in vary), per_user=per_user, tags=tags, cache_control=cache_control
+    )
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint._response_cache_policy = policy
+        return endpoint
+
+    return decorator
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class CachedRoute(APIRoute):
+    """Route class that serves the endpoints decorated with `cache_response` from `response_cache`."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        policy: Optional[CachePolicy] = getattr(self.endpoint, "_response_cache_policy", None)
+        if policy is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+
+            key = await response_cache.key_for(request, policy)
+            cached = await response_cache.get(key)
+            background = None
+            if cached is None:
+                response = await handler(request)
+                # Only plain, successful and cookie-free responses are shared
+                if (
+                    response.status_code != 200
+                    or isinstance(response, StreamingResponse)
+                    or "set-cookie" in response.headers
+                ):
+                    return response
+                cached = CachedResponse(response.status_code, list(response.headers.items()), response.body)
+                await response_cache.set(key, cached, policy.ttl)
+                background = response.background
+
+            headers = {"etag": cached.etag, "cache-control": policy.cache_control_header}
+            if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+                return Response(status_code=304, headers=headers, background=background)
+            response = Response(cached.body, status_code=cached.status_code, background=background)
+            response.raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in cached.headers]
+            for name, value in headers.items():
+                response.headers[name] = value
+            return response
+
+        return cached_handler
@@ -0,0 +1,18 @@
+# app/api/dependencies/services.py
+
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.loader import Loaders
+from src.db.session import get_db
+
+
+async def get_loaders(db: Annotated[AsyncSession, Depends(get_db)]) -> Loaders:
+    """
+    FastAPI dependency that provides the request's batch loaders, sharing the request's session.
+    Services use `loaders[crud].load(obj_id)` instead of `crud.get` in loops, so the lookups made
+    while handling one request are batched into `WHERE id IN (...)` queries and memoized.
+    """
+    return Loaders(db)
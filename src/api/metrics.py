@@ -0,0 +1,14 @@
+# app/api/metrics.py
+
+from fastapi import APIRouter, Response
+
+from src.core.metrics import render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics of every worker process."""
+    payload, content_type = render_metrics()
+    return Response(payload, media_type=content_type)
@@ -0,0 +1,204 @@
+# app/api/middleware/compression.py
+
+import asyncio
+import zlib
+from typing import Optional, Protocol, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Bodies this large are compressed in a worker thread instead of on the event loop
+_OFFLOAD_BYTES = 256 * 1024
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """Flushes the pending output, so that the client can decode everything sent so far."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> dict[str, tuple[type, int]]:
+    """Installed encodings with their compressor and configured level, in order of preference."""
+    encodings: dict[str, tuple[type, int]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = (ZstdCompressor, settings.COMPRESSION_ZSTD_LEVEL)
+    if brotli is not None:
+        encodings["br"] = (BrotliCompressor, settings.COMPRESSION_BROTLI_LEVEL)
+    encodings["gzip"] = (GzipCompressor, settings.COMPRESSION_GZIP_LEVEL)
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """
+    Picks the encoding for an Accept-Encoding header: the highest q-value wins, ties go to the first of
+    `supported`. Returns None if the client accepts none of them.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.lower()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses responses with zstd, brotli (when installed) or gzip, as negotiated
+    from Accept-Encoding.
+
+    Only responses whose media type starts with one of COMPRESSION_CONTENT_TYPES and that are not encoded
+    already are compressed. Complete bodies are compressed if they are at least COMPRESSION_MINIMUM_SIZE
+    bytes. Streaming bodies are compressed chunk by chunk, each chunk flushed so that the client receives
+    it right away.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.encodings = available_encodings()
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        self.content_types = tuple(settings.COMPRESSION_CONTENT_TYPES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.encodings))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        compressor_class, level = self.encodings[encoding]
+        start_message: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                passthrough = "content-encoding" in headers or not media_type.startswith(self.content_types)
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message  # sent with the first body chunk, once the headers are settled
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = MutableHeaders(scope=start_message)
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = compressor_class(level)
+                if more_body:
+                    del headers["content-length"]
+                    body = compressor.compress(body) + compressor.flush()
+                else:
+                    body = await self._compress_all(compressor, body)
+                    headers["content-length"] = str(len(body))
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                # The compressed representation differs byte for byte, so a strong ETag becomes weak
+                etag = headers.get("etag")
+                if etag is not None and etag.startswith('"'):
+                    headers["etag"] = f"W/{etag}"
+                await send(start_message)
+                start_message = None
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            body = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    async def _compress_all(compressor: Compressor, body: bytes) -> bytes:
+        def compress() -> bytes:
+            return compressor.compress(body) + compressor.finish()
+
+        return await asyncio.to_thread(compress) if len(body) >= _OFFLOAD_BYTES else compress()
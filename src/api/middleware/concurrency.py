@@ -0,0 +1,144 @@
+# app/api/middleware/concurrency.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.exceptions import ServiceOverloadedException
+from src.core.metrics import CONCURRENCY_IN_FLIGHT, CONCURRENCY_LIMIT, CONCURRENCY_SHED
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Caps in-flight requests with a limit adapted to the observed latency (AIMD): a request slower than
+    `latency_target` multiplies the limit by `backoff`, a faster one while the limit is in use grows it
+    by `1 / limit` (about +1 per `limit` requests). Only requests admitted after the last decrease can
+    decrease it again, so one slow burst shrinks the limit once rather than once per request.
+    Requests over the limit wait in FIFO order for up to `queue_timeout` seconds and are shed
+    with `ServiceOverloadedException` after that, or right away once `max_queue` are waiting.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        queue_timeout: float,
+        max_queue: int,
+        backoff: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.backoff = backoff
+        self.in_flight = 0
+        self.shed = {"queue_full": 0, "timeout": 0}
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    async def acquire(self) -> None:
+        """Takes a slot, waiting for one if needed. Raises ServiceOverloadedException when shedding."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._take()
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            # A slot handed over in the same tick as the timeout is already ours, take it rather than leak it
+            if waiter.done() and not waiter.cancelled():
+                return
+            self._shed("timeout")
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._give_back()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self, admitted_at: float) -> None:
+        """Returns the slot of a request admitted at `admitted_at` (time.monotonic) and adapts the limit."""
+        now = time.monotonic()
+        if now - admitted_at > self.latency_target:
+            if admitted_at >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif self.in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+        self._give_back()
+
+    def snapshot(self) -> dict[str, float]:
+        return {"limit": self.limit, "in_flight": self.in_flight, "queued": len(self._waiters), **self.shed}
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        CONCURRENCY_IN_FLIGHT.inc()
+
+    def _give_back(self) -> None:
+        self.in_flight -= 1
+        CONCURRENCY_IN_FLIGHT.dec()
+        # Hand the freed slots to the oldest waiters
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def _shed(self, reason: str) -> None:
+        self.shed[reason] += 1
+        CONCURRENCY_SHED.labels(reason).inc()
+        raise ServiceOverloadedException()
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Pure ASGI middleware that admits requests through an `AdaptiveConcurrencyLimiter` configured from
+    the CONCURRENCY_* settings. Paths under CONCURRENCY_CRITICAL_PATHS (health checks, metrics) bypass it.
+    Shed requests are raised as `ServiceOverloadedException`, so it must run inside `ErrorHandlingMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[AdaptiveConcurrencyLimiter] = None) -> None:
+        self.app = app
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(
+            initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+            min_limit=settings.CONCURRENCY_MIN_LIMIT,
+            max_limit=settings.CONCURRENCY_MAX_LIMIT,
+            latency_target=settings.CONCURRENCY_LATENCY_TARGET_SECONDS,
+            queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+            max_queue=settings.CONCURRENCY_MAX_QUEUE,
+        )
+        self.critical_paths = tuple(path.rstrip("/") for path in settings.CONCURRENCY_CRITICAL_PATHS)
+
+    def _is_critical(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.critical_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_critical(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        await self.limiter.acquire()
+        admitted_at = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(admitted_at)
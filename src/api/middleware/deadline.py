@@ -0,0 +1,78 @@
+# app/api/middleware/deadline.py
+
+import asyncio
+import math
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.deadline import Deadline, bind_deadline, current_deadline
+from src.core.exceptions import RequestTimeoutException
+
+TIMEOUT_HEADER = "x-request-timeout"
+
+
+def _client_timeout(scope: Scope) -> Optional[float]:
+    """The budget the client sent in X-Request-Timeout (seconds), if any and valid."""
+    value = Headers(scope=scope).get(TIMEOUT_HEADER)
+    try:
+        timeout = float(value) if value is not None else None
+    except ValueError:
+        return None
+    return timeout if timeout is not None and math.isfinite(timeout) and timeout > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    Pure ASGI middleware that gives each request a deadline: REQUEST_TIMEOUT_SECONDS by default, a route's own
+    (see `RequestTimeout`), and never more than a client sent in ``X-Request-Timeout``. The handler is cancelled
+    once it expires and the request fails with `RequestTimeoutException`, so it must run inside
+    `ErrorHandlingMiddleware`. The remaining budget also bounds the database statements of the request
+    (see `remaining_time`). The deadline covers the handler only: once the response has started, the body
+    (e.g. a streamed export) is sent without one, since it could no longer be turned into a 504.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.default_timeout = settings.REQUEST_TIMEOUT_SECONDS or None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client_timeout = _client_timeout(scope)
+        timeouts = [t for t in (self.default_timeout, client_timeout) if t is not None]
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        try:
+            async with asyncio.timeout_at(started_at + min(timeouts) if timeouts else None) as timeout_scope:
+
+                async def send_wrapper(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        timeout_scope.reschedule(None)
+                    await send(message)
+
+                with bind_deadline(Deadline(timeout_scope, started_at, client_timeout)):
+                    await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not timeout_scope.expired():
+                raise
+            raise RequestTimeoutException() from None
+
+
+class RequestTimeout:
+    """
+    FastAPI dependency that gives a route its own deadline instead of REQUEST_TIMEOUT_SECONDS, e.g.
+    `@router.post("/reports", dependencies=[Depends(RequestTimeout(120))])`. Requires `DeadlineMiddleware`.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    async def __call__(self) -> None:
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.reset(self.seconds)
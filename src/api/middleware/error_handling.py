@@ -2,36 +2,77 @@
 
 import logging
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.core.exceptions import CustomException  # Your custom base exception
 
 error_logger = logging.getLogger("api.errors")
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class ErrorHandlingMiddleware:
+    """
+    Pure ASGI middleware that turns exceptions into the ``{"detail", "code"}`` JSON envelope.
+
+    If the response has already started (e.g. a ``StreamingResponse`` failing mid-body) a new
+    response cannot be sent, so the exception is re-raised for the server to handle.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except CustomException as e:
             # Handle your custom application exceptions
-            error_logger.warning(f"Custom error for {request.url.path}: {e.detail}", exc_info=True)
-            return JSONResponse(
+            error_logger.warning(f"Custom error for {scope['path']}: {e.detail}", exc_info=True)
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=e.status_code,
                 content={"detail": e.detail, "code": e.code},  # Custom error codes
+                headers=e.headers,
             )
+            await response(scope, receive, send)
         except Exception as e:
             # Catch all other unexpected exceptions
-            error_logger.exception(f"Unhandled exception for {request.url.path}: {e}")
-            return JSONResponse(
+            error_logger.exception(f"Unhandled exception for {scope['path']}: {e}")
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": "An unexpected error occurred. Please try again later.", "code": "SERVER_ERROR"},
             )
+            await response(scope, receive, send)
+
+
+async def custom_exception_handler(request: Request, exc: CustomException) -> JSONResponse:
+    """
+    Renders a CustomException raised by an endpoint or dependency in the same envelope as the middleware.
+    FastAPI's default HTTPException handler catches those before they reach the middleware and drops the code.
+    """
+    error_logger.warning(f"Custom error for {request.url.path}: {exc.detail}")
+    return JSONResponse(
+        status_code=exc.status_code, content={"detail": exc.detail, "code": exc.code}, headers=exc.headers
+    )
 
 
 # To add to FastAPI app in main.py:
 # from app.api.middleware.error_handling import ErrorHandlingMiddleware
 # app.add_middleware(ErrorHandlingMiddleware)
+# app.add_exception_handler(CustomException, custom_exception_handler)
@@ -0,0 +1,50 @@
+# app/api/middleware/metrics.py
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS, HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that counts requests and observes their latency per route template
+    (e.g. `/v1/items/{item_id}`, or `unmatched` for 404s) so that label cardinality stays bounded.
+    Labelled metric children are cached, which keeps the cost to a few microseconds per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._children: dict[tuple[str, str, int], tuple] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            key = (scope["method"], route, status_code)
+            children = self._children.get(key)
+            if children is None:
+                children = self._children[key] = (
+                    HTTP_REQUESTS.labels(scope["method"], route, str(status_code)),
+                    HTTP_REQUEST_DURATION.labels(scope["method"], route),
+                )
+            children[0].inc()
+            children[1].observe(time.perf_counter() - start_time)
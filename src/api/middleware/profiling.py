@@ -0,0 +1,107 @@
+# app/api/middleware/profiling.py
+
+import asyncio
+import hmac
+import logging
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover
+    Profiler = None
+
+profiling_logger = logging.getLogger("api.profiling")
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that profiles selected requests with pyinstrument (wall-clock, async-aware:
+    time spent awaiting is attributed to the awaiting code).
+
+    - Requests carrying ``PROFILING_TOKEN`` in the ``X-Profile`` header or the ``profile`` query parameter
+      get the HTML profile back instead of their response.
+    - A ``PROFILING_SAMPLE_RATE`` share of the other requests is profiled into ``PROFILING_DIR``.
+
+    It is only added to the app when ``PROFILING_ENABLED`` is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        if Profiler is None:
+            raise RuntimeError("PROFILING_ENABLED is set but the `pyinstrument` package is not installed")
+        self.app = app
+        self.token = settings.PROFILING_TOKEN.encode() if settings.PROFILING_TOKEN else None
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.directory = Path(settings.PROFILING_DIR)
+        self.interval = settings.PROFILING_INTERVAL
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._has_token(scope):
+            await self._profile_to_response(scope, receive, send)
+        elif self.sample_rate and random.random() < self.sample_rate:
+            await self._profile_to_file(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _has_token(self, scope: Scope) -> bool:
+        if self.token is None:
+            return False
+        value: Optional[str] = Headers(scope=scope).get("x-profile")
+        if value is None and b"profile=" in scope["query_string"]:
+            value = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+        return value is not None and hmac.compare_digest(value.encode(), self.token)
+
+    async def _profile_to_response(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        html = await asyncio.to_thread(profiler.output_html)
+        await HTMLResponse(html, headers={"cache-control": "no-store"})(scope, receive, send)
+
+    async def _profile_to_file(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            # Rendering and writing can take a while for long requests, keep them off the event loop
+            await asyncio.to_thread(self._write, profiler, scope)
+
+    def _write(self, profiler: "Profiler", scope: Scope) -> None:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:8]}.html"
+        path = self.directory / name
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(profiler.output_html(), encoding="utf-8")
+        except OSError:
+            profiling_logger.exception(f"Could not write the profile of {scope['method']} {scope['path']}")
+        else:
+            profiling_logger.info(f"Profiled {scope['method']} {scope['path']} to {path}")
+
+
+# To add to FastAPI app in main.py:
+# from app.api.middleware.profiling import ProfilingMiddleware
+# app.add_middleware(ProfilingMiddleware)
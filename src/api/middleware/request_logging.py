@@ -3,30 +3,60 @@
 import logging
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.db.query_stats import collect_query_stats, query_logger
 
 # Configure a logger for requests
 request_logger = logging.getLogger("api.requests")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        """
-        Logs incoming request details and response status/duration.
-        """
-        start_time = time.time()
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware that logs incoming request details and response status/duration.
+
+    Implemented without ``BaseHTTPMiddleware`` so that no extra task or memory stream is
+    spawned per request and streaming responses are passed through untouched.
+
+    The response line also carries the request's query count, total DB time and slowest statement,
+    and a warning is logged when the request repeats a statement more than ``DB_N_PLUS_ONE_THRESHOLD`` times.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
         # Log request details (path, method, client IP)
-        request_logger.info(f"Request: {request.method} {request.url.path} from {request.client.host}")
+        request_logger.info(f"Request: {method} {path} from {client[0] if client else None}")
+
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        response = await call_next(request)
+        with collect_query_stats() as stats:
+            await self.app(scope, receive, send_wrapper)
 
-        process_time = time.time() - start_time
-        # Log response details (status code, processing time)
+        process_time = time.perf_counter() - start_time
+        # Log response details (status code, processing time, queries)
         request_logger.info(
-            f"Response: {request.method} {request.url.path} Status: {response.status_code} Took: {process_time:.4f}s"
+            f"Response: {method} {path} Status: {status_code} Took: {process_time:.4f}s {stats.summary()}"
         )
-        return response
+        if settings.DB_N_PLUS_ONE_THRESHOLD:
+            for statement, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+                query_logger.warning(f"Possible N+1 query in {method} {path}: ran {count} times: {statement}")
 
 
 # To add to FastAPI app in main.py:
@@ -0,0 +1,65 @@
+# app/api/middleware/tracing.py
+
+import re
+import uuid
+from dataclasses import replace
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.tracing import TraceContext, current_context, new_trace_id, parse_traceparent, tracer
+
+# Incoming ids are echoed in logs and headers, so only short, printable ones are accepted
+_VALID_ID = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+
+def _valid_id(value: Optional[str]) -> Optional[str]:
+    return value if value is not None and _VALID_ID.match(value) else None
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware that runs each request in a server span.
+
+    The trace continues the caller's W3C ``traceparent`` header, if any, and the request id comes from
+    ``X-Request-ID`` (generated when missing); ``X-Correlation-ID`` defaults to the request id.
+    They are kept in a context variable for the log filter and child spans (DB queries, outbound calls),
+    and the response carries ``X-Request-ID`` and ``traceparent`` headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = _valid_id(headers.get("x-request-id")) or uuid.uuid4().hex
+        correlation_id = _valid_id(headers.get("x-correlation-id")) or request_id
+        # Without a valid traceparent the server span below is the root of a new trace
+        parent = parse_traceparent(headers.get("traceparent")) or TraceContext(trace_id=new_trace_id(), span_id=None)
+        parent = replace(parent, request_id=request_id, correlation_id=correlation_id)
+
+        with tracer.span(f"{scope['method']} {scope['path']}", kind="server", parent=parent) as span:
+            traceparent = current_context().traceparent
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["x-request-id"] = request_id
+                    response_headers["traceparent"] = traceparent
+                await send(message)
+
+            span.attributes.update({"http.method": scope["method"], "http.target": scope["path"]})
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Name the span after the route template, so that spans of the same endpoint group together
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.name = f"{scope['method']} {route}"
+                    span.attributes["http.route"] = route
@@ -0,0 +1,315 @@
+# app/api/rate_limit.py
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, Protocol
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.exceptions import RateLimitExceededException
+from src.core.security import JWTError, decode_access_token
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover
+    redis_asyncio = None
+
+RateLimitKey = Literal["ip", "user", "route"]
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the full limit is available again
+    retry_after: float  # seconds until a request would be allowed, 0 if this one was
+
+    def headers(self, window: float) -> dict[str, str]:
+        """The `RateLimit-*` headers of the IETF draft, plus `Retry-After` for rejections."""
+        headers = {
+            "RateLimit-Policy": f"{self.limit};w={math.ceil(window)}",
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class TokenBucket:
+    """
+    Buckets of `limit` tokens refilled at `limit / window` tokens per second; each request takes one.
+    Allows bursts of up to `limit` requests, then a steady rate.
+    """
+
+    # KEYS[1]: bucket, ARGV: limit, window, now. Returns whether the request is allowed and the tokens left.
+    script = """
+local limit, window, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or limit
+local ts = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + math.max(0, now - ts) * limit / window)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.rate = limit / window
+
+    def step(self, state: Optional[tuple[float, float]], now: float) -> tuple[tuple[float, float], RateLimitResult]:
+        tokens, ts = state if state is not None else (self.limit, now)
+        tokens = min(self.limit, tokens + max(0.0, now - ts) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        return (tokens, now), self.result(allowed, tokens)
+
+    def result(self, allowed: bool, tokens: float) -> RateLimitResult:
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=int(tokens),
+            reset_after=(self.limit - tokens) / self.rate,
+            retry_after=0.0 if allowed else (1 - tokens) / self.rate,
+        )
+
+    def from_script(self, reply: list[Any], now: float) -> RateLimitResult:
+        return self.result(bool(int(reply[0])), float(reply[1]))
+
+
+class SlidingWindow:
+    """
+    Sliding window counter: at most `limit` requests in any `window` seconds, estimated from the counts
+    of the current and the previous fixed window (weighted by how much of it still overlaps).
+    Smoother than fixed windows, without keeping a timestamp per request.
+    """
+
+    # KEYS[1]: counters, ARGV: limit, window, now. Returns whether the request is allowed and both counts.
+    script = """
+local limit, window, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'index', 'current', 'previous')
+local index = math.floor(now / window)
+local stored, current, previous = tonumber(state[1]), tonumber(state[2]) or 0, tonumber(state[3]) or 0
+if stored == nil or index > stored + 1 then
+    current, previous = 0, 0
+elseif index == stored + 1 then
+    current, previous = 0, current
+end
+local weight = 1 - (now - index * window) / window
+local allowed = 0
+if previous * weight + current + 1 <= limit then
+    current = current + 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'index', index, 'current', current, 'previous', previous)
+redis.call('PEXPIRE', KEYS[1], math.ceil(2 * window * 1000))
+return {allowed, current, previous}
+"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+
+    def step(self, state: Optional[tuple[int, int, int]], now: float) -> tuple[tuple[int, int, int], RateLimitResult]:
+        index = int(now // self.window)
+        stored, current, previous = state if state is not None else (index, 0, 0)
+        if index > stored + 1:
+            current, previous = 0, 0
+        elif index == stored + 1:
+            current, previous = 0, current
+        allowed = self._estimate(current, previous, now) + 1 <= self.limit
+        if allowed:
+            current += 1
+        return (index, current, previous), self.result(allowed, current, previous, now)
+
+    def result(self, allowed: bool, current: int, previous: int, now: float) -> RateLimitResult:
+        elapsed = now % self.window
+        estimated = self._estimate(current, previous, now)
+        if allowed:
+            retry_after = 0.0
+        elif current + 1 > self.limit:
+            # Only the next window has room
+            retry_after = self.window - elapsed
+        else:
+            # Wait until enough of the previous window has slid out
+            retry_after = self.window * (1 - (self.limit - 1 - current) / previous) - elapsed
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=max(0, math.floor(self.limit - estimated)),
+            # Requests counted in the current window weigh on the limit until the end of the next one
+            reset_after=2 * self.window - elapsed if current else (self.window - elapsed if previous else 0.0),
+            retry_after=max(0.0, retry_after),
+        )
+
+    def from_script(self, reply: list[Any], now: float) -> RateLimitResult:
+        return self.result(bool(int(reply[0])), int(reply[1]), int(reply[2]), now)
+
+    def _estimate(self, current: int, previous: int, now: float) -> float:
+        return previous * (1 - (now % self.window) / self.window) + current
+
+
+Algorithm = TokenBucket | SlidingWindow
+
+
+class RateLimitBackend(Protocol):
+    """Storage for the rate limit state, updated atomically per request."""
+
+    async def hit(self, algorithm: Algorithm, key: str) -> RateLimitResult: ...
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process state in an LRU bounded to `max_keys` entries: O(1) per request, and the least recently
+    seen clients are evicted first (which at worst resets their limit).
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._states: OrderedDict[str, Any] = OrderedDict()
+
+    async def hit(self, algorithm: Algorithm, key: str) -> RateLimitResult:
+        state, result = algorithm.step(self._states.get(key), time.time())
+        self._states[key] = state
+        self._states.move_to_end(key)
+        if len(self._states) > self.max_keys:
+            self._states.popitem(last=False)
+        return result
+
+
+class RedisRateLimitBackend:
+    """
+    Backend shared by every worker, for a `redis.asyncio.Redis` compatible client. Each request runs one
+    Lua script, so concurrent workers update a key atomically; keys expire once their window has passed.
+    """
+
+    def __init__(self, client: Any, prefix: str = "rate-limit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, algorithm: Algorithm, key: str) -> RateLimitResult:
+        now = time.time()
+        reply = await self.client.eval(
+            algorithm.script, 1, f"{self.prefix}{key}", algorithm.limit, algorithm.window, repr(now)
+        )
+        return algorithm.from_script(reply, now)
+
+
+def build_rate_limit_backend() -> RateLimitBackend:
+    """Creates the backend selected by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND is 'redis' but the `redis` package is not installed")
+        return RedisRateLimitBackend(redis_asyncio.from_url(settings.REDIS_URL))
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limit_backend = build_rate_limit_backend()
+
+
+def build_algorithm(name: Literal["token_bucket", "sliding_window"], limit: int, window: float) -> Algorithm:
+    return TokenBucket(limit, window) if name == "token_bucket" else SlidingWindow(limit, window)
+
+
+def client_identity(scope: Scope, key: RateLimitKey) -> str:
+    """
+    The part of the rate limit key that identifies the caller: the client IP, the `sub` of a valid bearer
+    token (falling back to the IP for anonymous callers) or nothing, for one limit shared by everybody.
+    """
+    if key == "route":
+        return ""
+    if key == "user":
+        scheme, _, token = (Headers(scope=scope).get("authorization") or "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                return f"user:{decode_access_token(token)['sub']}"
+            except (JWTError, KeyError):
+                pass
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimiter:
+    """
+    FastAPI dependency that rate limits an endpoint, e.g.
+    `@router.post("/login", dependencies=[Depends(RateLimiter(5, 60, key="ip"))])`.
+    Each endpoint has its own limit per caller (see `client_identity`). Responses get the `RateLimit-*`
+    headers and rejected requests a 429 in the usual error envelope.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        *,
+        algorithm: Literal["token_bucket", "sliding_window"] = "token_bucket",
+        key: RateLimitKey = "ip",
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.algorithm = build_algorithm(algorithm, limit, window)
+        self.key = key
+        self.backend = backend
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        backend = self.backend or rate_limit_backend
+        result = await backend.hit(self.algorithm, f"{route}:{client_identity(request.scope, self.key)}")
+        headers = result.headers(self.algorithm.window)
+        if not result.allowed:
+            raise RateLimitExceededException(headers=headers)
+        response.headers.update(headers)
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware that applies the default limit (RATE_LIMIT_REQUESTS per RATE_LIMIT_WINDOW_SECONDS
+    and RATE_LIMIT_KEY caller) to every request outside RATE_LIMIT_EXEMPT_PATHS, as admission control in
+    front of the endpoints. Rejections are raised as `RateLimitExceededException`, so it must run inside
+    `ErrorHandlingMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp, backend: Optional[RateLimitBackend] = None) -> None:
+        self.app = app
+        self.backend = backend
+        self.algorithm = build_algorithm(
+            settings.RATE_LIMIT_ALGORITHM, settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS
+        )
+        self.key = settings.RATE_LIMIT_KEY
+        self.exempt_paths = frozenset(settings.RATE_LIMIT_EXEMPT_PATHS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        backend = self.backend or rate_limit_backend
+        result = await backend.hit(self.algorithm, f"*:{client_identity(scope, self.key)}")
+        headers = result.headers(self.algorithm.window)
+        if not result.allowed:
+            raise RateLimitExceededException(headers=headers)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    # Endpoint limits are usually stricter, keep theirs
+                    if name not in response_headers:
+                        response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,94 @@
+# app/api/streaming.py
+
+import csv
+import io
+from typing import Any, AsyncIterable, Optional, Sequence, Type
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+
+from src.core.config import settings
+from src.core.serialization import get_json_dumps
+
+
+def ndjson_response(
+    rows: AsyncIterable[Any],
+    *,
+    schema: Optional[Type[BaseModel]] = None,
+    batch_size: int = 100,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Streams rows as newline-delimited JSON in constant memory.
+    ORM objects are converted through `schema` (validated from attributes), anything else through jsonable_encoder.
+    Rows are pulled only as fast as the client reads them, `batch_size` lines per chunk.
+
+    FastAPI closes `get_db` sessions before the body is streamed, so export endpoints should
+    open their own session inside the row generator (the request deadline ends once the response starts,
+    so it bounds neither the body nor that session's statements), e.g.:
+
+        async def rows():
+            async with AsyncSessionLocal() as session:
+                async for obj in crud.stream(session):
+                    yield obj
+
+        return ndjson_response(rows(), schema=ProjectSchema)
+    """
+    dumps = get_json_dumps(settings.JSON_SERIALIZER)
+
+    async def body():
+        buffer = []
+        async for row in rows:
+            buffer.append(dumps(_to_data(row, schema)))
+            if len(buffer) >= batch_size:
+                yield b"\n".join(buffer) + b"\n"
+                buffer.clear()
+        if buffer:
+            yield b"\n".join(buffer) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=_attachment(filename))
+
+
+def csv_response(
+    rows: AsyncIterable[Any],
+    *,
+    fields: Sequence[str],
+    batch_size: int = 100,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Streams rows as CSV (header + one line per row) in constant memory.
+    Values are read as attributes from ORM objects/models or as keys from dicts.
+    See `ndjson_response` for session handling.
+    """
+
+    async def body():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        pending = 0
+        async for row in rows:
+            get = row.get if isinstance(row, dict) else lambda f, r=row: getattr(r, f, None)
+            writer.writerow([get(f) for f in fields])
+            pending += 1
+            if pending >= batch_size:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue().encode("utf-8")
+
+    return StreamingResponse(body(), media_type="text/csv", headers=_attachment(filename))
+
+
+def _to_data(row: Any, schema: Optional[Type[BaseModel]]) -> Any:
+    if schema is not None:
+        return schema.model_validate(row, from_attributes=True).model_dump(mode="json")
+    if isinstance(row, BaseModel):
+        return row.model_dump(mode="json")
+    return jsonable_encoder(row)
+
+
+def _attachment(filename: Optional[str]) -> Optional[dict]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'} if filename else None
@@ -1,8 +1,28 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.core.health import health_checks
 
 router = APIRouter(prefix="/healthz", tags=["Health"])
 
 
 @router.get("")
+@router.get("/live")
 async def healthz():
+    """Liveness: the process serves requests. Checks no dependency, so that an outage doesn't restart every pod."""
     return {}
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness: every critical dependency answered its last check and the service is not draining.
+    Served from the results of the background checks (see `HealthRegistry`), with 503 when not ready.
+    """
+    results = await health_checks.refresh()
+    ready = health_checks.ready
+    content = {
+        "status": "draining" if health_checks.draining else "ready" if ready else "not_ready",
+        "checks": {name: result.as_dict() for name, result in results.items()},
+    }
+    return JSONResponse(content, status_code=200 if ready else 503, headers={"Cache-Control": "no-store"})
@@ -31,7 +31,104 @@ class ApplicationSettings(BaseSettings):
     UVICORN_LOG_LEVEL: Literal["CRITICAL", "FATAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "WARNING"
     REQUEST_LOG_LEVEL: Literal["CRITICAL", "FATAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "INFO"
     ERROR_LOG_LEVEL: Literal["CRITICAL", "FATAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "ERROR"
+    LOG_QUEUE_ENABLED: bool = False
+    LOG_QUEUE_MAX_SIZE: int = 10_000
+    LOG_QUEUE_OVERFLOW_POLICY: Literal["block", "drop_oldest", "drop"] = "drop"
+    LOG_QUEUE_BATCH_SIZE: int = 256
+    JSON_SERIALIZER: Literal["auto", "orjson", "msgspec", "stdlib"] = "auto"
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1  # seconds, -1 to disable
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 0.0  # only ping connections idle longer than this, 0 pings every checkout
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg's per-connection prepared statement cache
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # SQLAlchemy's asyncpg dialect prepared statement cache
+    DB_PGBOUNCER_MODE: bool = False  # disable prepared statement caching for pgbouncer in transaction mode
+    DATABASE_READ_URLS: Annotated[list[str] | str, PlainValidator(parse_cors)] = []
+    DB_REPLICA_RETRY_SECONDS: float = 30.0  # how long a failing read replica is taken out of rotation
+    DB_SLOW_QUERY_SECONDS: float = 1.0  # statements taking longer are logged to "db.queries", 0 disables it
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # warn when a request runs the same statement more often, 0 disables it
+    # Signs pagination cursors. Set it when running more than one worker, otherwise each process
+    # uses its own random key and cursors only work on the worker that issued them.
+    CURSOR_SECRET: str | None = None
+    SECRET_KEY: str | None = None  # signs access tokens; required to issue or verify them
+    ALGORITHM: str = "HS256"
+    # Rotating signing keys: kid -> HMAC secret or PEM key (private for the active key, public is enough for the
+    # others), e.g. JWT_KEYS='{"2025-01": "...", "2025-06": "..."}' with JWT_ACTIVE_KID="2025-06"
+    JWT_KEYS: dict[str, str] = {}
+    JWT_ACTIVE_KID: str | None = None
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10_000  # verified access tokens kept in memory, 0 disables the cache
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0  # never longer than the token's own `exp`
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis"] = "memory"  # "redis" shares the cache between workers
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000  # per process, for the memory backend
+    REDIS_URL: str = "redis://localhost:6379/0"
+    PASSWORD_HASH_WORKERS: int = 4  # threads that run bcrypt for the async password helpers
+    PASSWORD_HASH_MAX_PENDING: int = 64  # hashes running or queued before new ones fail fast with 503
+    # Default deadline of a request (0 for none), also bounding its Postgres statements (statement_timeout).
+    # Routes can set their own with RequestTimeout, clients can only shorten it with an X-Request-Timeout header.
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    # Default rate limit for every request (admission control), endpoints can add their own with RateLimiter
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    RATE_LIMIT_ALGORITHM: Literal["token_bucket", "sliding_window"] = "token_bucket"
+    RATE_LIMIT_KEY: Literal["ip", "user", "route"] = "ip"  # "user" is the token's `sub`, falling back to the IP
+    RATE_LIMIT_EXEMPT_PATHS: Annotated[list[str] | str, PlainValidator(parse_cors)] = [
+        "/metrics",
+        "/v1/healthz",
+        "/v1/healthz/live",
+        "/v1/healthz/ready",
+    ]
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"  # "redis" (REDIS_URL) shares limits between workers
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # callers tracked per process by the memory backend, least recent evicted
+    # Response compression (zstd and brotli when `zstandard` / `brotli` are installed, gzip always), see
+    # scripts/benchmarks/compression.py to pick levels
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes, smaller complete bodies are sent as they are
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (fastest) to 9
+    COMPRESSION_BROTLI_LEVEL: int = 4  # 0 to 11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1 to 22
+    COMPRESSION_CONTENT_TYPES: Annotated[list[str] | str, PlainValidator(parse_cors)] = [
+        "application/json",
+        "application/x-ndjson",
+        "application/problem+json",
+        "application/xml",
+        "application/javascript",
+        "image/svg+xml",
+        "text/",
+    ]
+    # Adaptive cap on in-flight requests per worker (AIMD on latency), see ConcurrencyLimitMiddleware
+    CONCURRENCY_LIMIT_ENABLED: bool = False
+    CONCURRENCY_INITIAL_LIMIT: int = 20
+    CONCURRENCY_MIN_LIMIT: int = 2
+    CONCURRENCY_MAX_LIMIT: int = 200
+    CONCURRENCY_LATENCY_TARGET_SECONDS: float = 0.5  # slower requests shrink the limit, faster ones grow it
+    CONCURRENCY_QUEUE_TIMEOUT_SECONDS: float = 0.5  # how long a request waits for a slot before a 503
+    CONCURRENCY_MAX_QUEUE: int = 100  # waiting requests beyond this are shed right away
+    CONCURRENCY_CRITICAL_PATHS: Annotated[list[str] | str, PlainValidator(parse_cors)] = ["/metrics", "/v1/healthz"]
+    # Readiness (/v1/healthz/ready) serves the results of dependency checks run in the background
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # a check slower than this counts as down
+    # On SIGTERM, fail readiness for this long before shutting down, 0 disables. Only with servers that install
+    # their handlers with signal.signal (uvicorn), not loop.add_signal_handler (gunicorn's UvicornWorker)
+    HEALTH_DRAIN_SECONDS: float = 0.0
+    METRICS_ENABLED: bool = True  # /metrics; set PROMETHEUS_MULTIPROC_DIR to aggregate multiple workers
+    METRICS_LOOP_LAG_INTERVAL: float = 1.0  # seconds between event-loop lag probes, 0 disables them
+    # Spans of sampled traces: "memory" keeps them in process (tests), "file" appends JSON lines to TRACING_FILE_PATH
+    # and "otlp" sends them to an OpenTelemetry collector (OTLP/HTTP JSON) at TRACING_OTLP_ENDPOINT
+    TRACING_EXPORTER: Literal["none", "memory", "file", "otlp"] = "none"
+    TRACING_FILE_PATH: str = "spans.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_OTLP_HEADERS: dict[str, str] = {}
+    # Request profiling with pyinstrument, see ProfilingMiddleware
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str | None = None  # sent as `X-Profile` header or `profile` query param to get the profile back
+    PROFILING_SAMPLE_RATE: float = 0.0  # share of requests (0 to 1) profiled into PROFILING_DIR
+    PROFILING_DIR: str = "profiles"
+    PROFILING_INTERVAL: float = 0.001  # seconds between samples
     FRONTEND_HOST: str = "http://localhost:8000"
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, PlainValidator(parse_cors)] = []
 
@@ -0,0 +1,61 @@
+# app/core/deadline.py
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Deadline:
+    """
+    Time budget of the current request, enforced by the `asyncio.timeout` of `DeadlineMiddleware`.
+    `client_timeout` is the budget the client asked for, which a route can shorten but not extend.
+    """
+
+    def __init__(self, timeout_scope: asyncio.Timeout, started_at: float, client_timeout: Optional[float] = None):
+        self.timeout_scope = timeout_scope
+        self.started_at = started_at
+        self.client_timeout = client_timeout
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Expiry in event loop time (time.monotonic)."""
+        return self.timeout_scope.when()
+
+    def remaining(self) -> Optional[float]:
+        expires_at = self.expires_at
+        return None if expires_at is None else max(0.0, expires_at - asyncio.get_running_loop().time())
+
+    def reset(self, timeout: float) -> None:
+        """Gives the request `timeout` seconds from its start (at most what the client asked for)."""
+        if self.client_timeout is not None:
+            timeout = min(timeout, self.client_timeout)
+        self.timeout_scope.reschedule(self.started_at + timeout)
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def bind_deadline(deadline: Deadline) -> Iterator[Deadline]:
+    """Makes `deadline` the current one for the block."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None outside of a request with a deadline."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    try:
+        return deadline.remaining()
+    except RuntimeError:  # no running loop, e.g. a sync session in a worker thread
+        return None
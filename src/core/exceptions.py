@@ -6,8 +6,10 @@ from fastapi import HTTPException, status
 class CustomException(HTTPException):
     """Base class for custom application exceptions."""
 
-    def __init__(self, status_code: int, detail: str, code: str = "GENERIC_ERROR"):
-        super().__init__(status_code=status_code, detail=detail)
+    def __init__(
+        self, status_code: int, detail: str, code: str = "GENERIC_ERROR", headers: dict[str, str] | None = None
+    ):
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
         self.code = code
 
 
@@ -26,6 +28,43 @@ class NotPermittedException(CustomException):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail, code="NOT_PERMITTED")
 
 
+class InvalidCursorException(CustomException):
+    def __init__(self, detail: str = "Invalid or tampered pagination cursor."):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail, code="INVALID_CURSOR")
+
+
+class PasswordHashingBusyException(CustomException):
+    def __init__(self, detail: str = "Too many concurrent sign-in attempts, please retry shortly."):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            code="PASSWORD_HASHING_BUSY",
+            headers={"Retry-After": "1"},
+        )
+
+
+class RateLimitExceededException(CustomException):
+    def __init__(self, detail: str = "Too many requests, please retry later.", headers: dict[str, str] | None = None):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail, code="RATE_LIMITED", headers=headers
+        )
+
+
+class ServiceOverloadedException(CustomException):
+    def __init__(self, detail: str = "The service is overloaded, please retry shortly."):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            code="SERVICE_OVERLOADED",
+            headers={"Retry-After": "1"},
+        )
+
+
+class RequestTimeoutException(CustomException):
+    def __init__(self, detail: str = "The request did not complete within its deadline."):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail, code="REQUEST_TIMEOUT")
+
+
 # class ProjectBudgetExceededException(CustomException):
 #     def __init__(self, detail: str = "Adding this expense would exceed the project budget."):
 #         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail, code="BUDGET_EXCEEDED")
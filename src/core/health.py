@@ -0,0 +1,147 @@
+# app/core/health.py
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HealthCheck = Callable[[], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    healthy: bool
+    critical: bool
+    latency: float  # seconds
+    checked_at: datetime
+    error: Optional[str] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "status": "up" if self.healthy else "down",
+            "critical": self.critical,
+            "latency_ms": round(self.latency * 1000, 3),
+            "checked_at": self.checked_at.isoformat(),
+            "error": self.error,
+        }
+
+
+@dataclass(frozen=True)
+class _Check:
+    check: HealthCheck
+    critical: bool
+
+
+class HealthRegistry:
+    """
+    Dependency checks (database, replicas, caches...) run together in the background every `interval`
+    seconds, each bounded by `timeout`. Readiness is served from the last results, so probes never reach
+    the dependencies themselves; results older than `max_age` are refreshed on demand, once for all the
+    concurrent callers. The service is ready when every critical check passed and it is not draining.
+    """
+
+    def __init__(self, interval: float, timeout: float, max_age: Optional[float] = None):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age if max_age is not None else 3 * interval
+        self.draining = False
+        self.results: dict[str, CheckResult] = {}
+        self._checks: dict[str, _Check] = {}
+        self._checked_at: Optional[float] = None  # time.monotonic of the last run
+        self._refresh: Optional[asyncio.Task] = None
+
+    def register(self, name: str, check: HealthCheck, critical: bool = True) -> None:
+        """Adds (or replaces) a check: an async callable that raises, or times out, when `name` is down."""
+        self._checks[name] = _Check(check, critical)
+
+    @property
+    def ready(self) -> bool:
+        return not self.draining and all(result.healthy or not result.critical for result in self.results.values())
+
+    def start_draining(self) -> None:
+        """Fails readiness from now on, so that the load balancer stops sending traffic before shutdown."""
+        if not self.draining:
+            logger.info("Draining: readiness now fails")
+        self.draining = True
+
+    async def run_checks(self) -> dict[str, CheckResult]:
+        checks = dict(self._checks)
+        results = await asyncio.gather(*(self._run(check) for check in checks.values()))
+        self.results = dict(zip(checks, results, strict=True))
+        self._checked_at = time.monotonic()
+        return self.results
+
+    async def refresh(self) -> dict[str, CheckResult]:
+        """The results, checked again first if older than `max_age` (coalescing concurrent callers)."""
+        if self._checked_at is not None and time.monotonic() - self._checked_at <= self.max_age:
+            return self.results
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self.run_checks())
+        # Shielded, so that a probe giving up doesn't cancel the run the other callers wait for
+        return await asyncio.shield(self._refresh)
+
+    async def monitor(self) -> None:
+        """Runs the checks every `interval` seconds, for the lifetime of the application."""
+        while True:
+            try:
+                await self.run_checks()
+            except Exception:  # pragma: no cover - checks report their own failures
+                logger.exception("Health checks failed to run")
+            await asyncio.sleep(self.interval)
+
+    async def _run(self, check: _Check) -> CheckResult:
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(check.check(), self.timeout)
+        except TimeoutError:
+            error = f"Timed out after {self.timeout}s"
+        except Exception as e:
+            error = type(e).__name__
+        return CheckResult(
+            healthy=error is None,
+            critical=check.critical,
+            latency=time.perf_counter() - start,
+            checked_at=datetime.now(timezone.utc),
+            error=error,
+        )
+
+
+health_checks = HealthRegistry(settings.HEALTH_CHECK_INTERVAL_SECONDS, settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+
+
+def drain_on_signal(registry: HealthRegistry, delay: float, signals: tuple[int, ...] = (signal.SIGTERM,)) -> None:
+    """
+    Makes `signals` start draining `registry` and hands them to the server's own handler `delay` seconds later,
+    so that readiness fails while the server still accepts the requests routed to it before the load balancer
+    noticed. Call it once the server installed its handlers (e.g. in the lifespan); only works in the main thread.
+
+    The delay only applies to servers that install their handlers with `signal.signal`, like uvicorn itself.
+    Servers that use `loop.add_signal_handler` (e.g. gunicorn's UvicornWorker) are woken through the loop's
+    wakeup fd whatever the Python handler is, so they shut down right away; readiness still flips, but there
+    is no drain window (a warning is logged).
+    """
+    if delay <= 0 or threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for sig in signals:
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+        if getattr(previous, "__qualname__", None) == "_sighandler_noop":
+            # asyncio's placeholder for a `loop.add_signal_handler` handler, which runs regardless of this one
+            logger.warning(f"{signal.Signals(sig).name} is handled by the event loop, it won't wait {delay}s to drain")
+
+        def handler(signum, frame, previous=previous) -> None:
+            registry.start_draining()
+            loop.call_soon_threadsafe(loop.call_later, delay, previous, signum, frame)
+
+        signal.signal(sig, handler)
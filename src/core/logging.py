@@ -1,8 +1,116 @@
-import json
+import atexit
+import copy
 import logging
+import logging.config
+import logging.handlers
+import queue
 from typing import Literal
 
 from src.core.config import settings
+from src.core.serialization import get_json_log_formatter
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop"]
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue with a configurable overflow policy.
+
+    - ``block``: wait for room in the queue (never loses records, may stall the caller).
+    - ``drop_oldest``: discard the oldest queued record to make room for the new one.
+    - ``drop``: discard the new record.
+
+    Every discarded record is counted in ``dropped``.
+    """
+
+    def __init__(self, queue: queue.Queue, overflow_policy: OverflowPolicy = "drop"):
+        super().__init__(queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges message arguments and renders tracebacks, leaving formatting to the listener thread.
+        """
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.overflow_policy == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+        self.dropped += 1
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that drains up to ``batch_size`` records at a time and flushes its handlers once per batch.
+    """
+
+    def __init__(self, queue: queue.Queue, *handlers: logging.Handler, respect_handler_level: bool = False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = settings.LOG_QUEUE_BATCH_SIZE
+
+    def enqueue_sentinel(self) -> None:
+        # A full queue must not prevent the listener from being stopped
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [self.dequeue(True)]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.dequeue(False))
+            except queue.Empty:
+                pass
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            for _ in batch:
+                q.task_done()
+            if stop:
+                break
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the caller, so a whole batch is written with a single flush."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+_queue_listener: logging.handlers.QueueListener | None = None
 
 
 def get_logging_config(log_format: Literal["plaintext", "json"]):
@@ -27,11 +135,12 @@ def get_logging_config(log_format: Literal["plaintext", "json"]):
             },
         },
         "json": {
-            "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
+            **get_json_log_formatter(settings.JSON_SERIALIZER),
             "fmt": (
                 "%(asctime)s %(name)s %(levelname)s %(message)s "
                 "%(pathname)s %(lineno)d %(funcName)s %(process)d %(thread)d "
-                # "%(request_id)s %(user_id)s %(correlation_id)s %(trace_id)s %(span_id)s"
+                "%(request_id)s %(correlation_id)s %(trace_id)s %(span_id)s"
+                # "%(user_id)s"
             ),
             "rename_fields": {
                 # Timestamp and basic info
@@ -57,22 +166,39 @@ def get_logging_config(log_format: Literal["plaintext", "json"]):
                 "is_debug_enabled": settings.DEBUG,
                 "environment": settings.ENVIRONMENT.value,
             },
-            "json_ensure_ascii": False,
-            "json_serializer": json.dumps,  # Changed from json_encoder to json_serializer
         },
     }
 
+    console_handler = {
+        "class": "logging.StreamHandler",
+        "level": settings.LOG_LEVEL,  # Use global level for console handler
+        "formatter": "colored" if log_format == "plaintext" else "json",
+        "filters": ["trace_context"],
+        "stream": "ext://sys.stdout",
+    }
+    queue_handlers = {}
+    if settings.LOG_QUEUE_ENABLED:
+        # Loggers write to a bounded in-memory queue; a background thread formats and writes to stdout
+        queue_handlers["stdout"] = console_handler | {"class": "src.core.logging.BatchStreamHandler", "filters": []}
+        console_handler = {
+            "class": "src.core.logging.BoundedQueueHandler",
+            "level": settings.LOG_LEVEL,
+            "handlers": ["stdout"],
+            "listener": "src.core.logging.BatchingQueueListener",
+            "queue": {"()": "queue.Queue", "maxsize": settings.LOG_QUEUE_MAX_SIZE},
+            "overflow_policy": settings.LOG_QUEUE_OVERFLOW_POLICY,
+            # Filtered before the record is queued, while the request's context variables are still set
+            "filters": ["trace_context"],
+        }
+
     config = {
         "version": 1,
         "disable_existing_loggers": False,  # Keep False to not disable other loggers by default
         "formatters": common_formatters,
+        "filters": {"trace_context": {"()": "src.core.tracing.TraceContextFilter"}},
         "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL,  # Use global level for console handler
-                "formatter": "colored" if log_format == "plaintext" else "json",
-                "stream": "ext://sys.stdout",
-            },
+            "console": console_handler,
+            **queue_handlers,
             # Optional: File handler, can be adapted for plaintext or JSON
             # "file_handler": {
             #     "class": "logging.handlers.RotatingFileHandler",
@@ -142,6 +268,12 @@ def get_logging_config(log_format: Literal["plaintext", "json"]):
                 "level": settings.ERROR_LOG_LEVEL.upper(),
                 "propagate": False,
             },
+            # Slow queries and N+1 warnings
+            "db.queries": {
+                "handlers": ["console"],
+                "level": "WARNING",
+                "propagate": False,
+            },
             # If you want module-level loggers to propagate, set propagate=True
             # and ensure they don't have separate handlers specified here
             # For this setup, we're explicitly handling them to ensure consistency
@@ -167,6 +299,10 @@ def setup_logging():
         print(f"Warning: Invalid LOG_FORMAT '{log_format}'. Defaulting to 'plaintext'.")
         log_format = "plaintext"
 
+    # Drain and stop a listener from a previous call before its handlers are detached
+    global _queue_listener
+    _stop_queue_listener()
+
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -178,12 +314,27 @@ def setup_logging():
     config = get_logging_config(log_format)
     logging.config.dictConfig(config)
 
+    handler = logging.getHandlerByName("console")
+    if isinstance(handler, logging.handlers.QueueHandler) and handler.listener is not None:
+        _queue_listener = handler.listener
+        _queue_listener.start()
+        atexit.register(_stop_queue_listener)
+
     print(
         f"Logging configured for '{settings.APP_NAME}' in '{settings.ENVIRONMENT.value}' "
         f"environment using '{log_format}' format."
     )
 
 
+def _stop_queue_listener():
+    """Flushes pending records and stops the background logging thread, if any."""
+
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 # def setup_logging():
 #     """
 #     Sets up the application's logging configuration.
@@ -0,0 +1,95 @@
+# app/core/metrics.py
+
+import asyncio
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# When PROMETHEUS_MULTIPROC_DIR is set, every worker process writes its samples to that directory
+# and /metrics aggregates them (gauges use the multiprocess_mode given below).
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", multiprocess_mode="livesum"
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Open pooled database connections.", ["node"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Pooled database connections in use.", ["node"], multiprocess_mode="livesum"
+)
+DB_REQUEST_SESSIONS = Counter(
+    "db_request_sessions_total",
+    "Request sessions by the connection they checked out (primary, replica or none).",
+    ["connection"],
+)
+
+CONCURRENCY_LIMIT = Gauge(
+    "concurrency_limit", "Current adaptive limit of in-flight requests.", multiprocess_mode="livesum"
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "concurrency_in_flight", "Requests holding a concurrency slot.", multiprocess_mode="livesum"
+)
+CONCURRENCY_SHED = Counter(
+    "concurrency_shed_total", "Requests shed by the concurrency limit, by reason (queue_full or timeout).", ["reason"]
+)
+
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Latest event-loop lag.", multiprocess_mode="livemax")
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_distribution_seconds",
+    "Event-loop lag, measured as the oversleep of a periodic timer.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Returns the exposition payload and its content type, aggregated over all workers in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def instrument_pool(engine: AsyncEngine, node: str) -> None:
+    """Tracks open and checked out connections of the engine's pool, labelled with `node`."""
+    connections = DB_POOL_CONNECTIONS.labels(node)
+    checked_out = DB_POOL_CHECKED_OUT.labels(node)
+
+    event.listen(engine.sync_engine, "connect", lambda *args: connections.inc())
+    event.listen(engine.sync_engine, "close", lambda *args: connections.dec())
+    event.listen(engine.sync_engine, "close_detached", lambda *args: connections.dec())
+    event.listen(engine.sync_engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine.sync_engine, "checkin", lambda *args: checked_out.dec())
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """Measures how late a timer of `interval` seconds fires, i.e. how long ready work waits for the loop."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - start - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
@@ -1,12 +1,22 @@
 # app/core/security.py
 
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from typing import Any, Callable, Mapping, Optional, TypeVar, Union
 
-from jose import jwt  # Re-export JWTError for specific catching in dependencies
+from jose import JWTError, jwk, jwt  # Re-export JWTError for specific catching in dependencies
+from jose.backends.base import Key
 from passlib.context import CryptContext
 
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.exceptions import PasswordHashingBusyException
+from src.core.tracing import tracer
+
+T = TypeVar("T")
 
 # Password hashing context (Bcrypt is generally recommended)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,9 +32,116 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt releases the GIL, so a small thread pool keeps the event loop free while hashes run
+_password_executor: Optional[ThreadPoolExecutor] = None
+_pending_password_jobs = 0
+_pending_password_jobs_lock = threading.Lock()
+
+
+def _password_job_done(future: Future) -> None:
+    global _pending_password_jobs
+    with _pending_password_jobs_lock:
+        _pending_password_jobs -= 1
+
+
+async def _run_password_job(func: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a bcrypt call on the password thread pool.
+    Fails fast with PasswordHashingBusyException once PASSWORD_HASH_MAX_PENDING jobs are running or queued,
+    so a login storm gets quick 503s instead of ever growing latency for every caller.
+    """
+    global _password_executor, _pending_password_jobs
+    with _pending_password_jobs_lock:
+        if _pending_password_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHashingBusyException()
+        _pending_password_jobs += 1
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+
+    future = _password_executor.submit(func, *args)
+    # Counted until the job itself is done: a cancelled caller doesn't stop a hash that already runs
+    future.add_done_callback(_password_job_done)
+    with tracer.span(func.__name__):
+        return await asyncio.wrap_future(future)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Async variant of `verify_password` that does not block the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """Async variant of `get_password_hash` that does not block the event loop."""
+    return await _run_password_job(get_password_hash, password)
+
+
+DEFAULT_KID = "default"
+
+
+class KeyRing:
+    """
+    JWT signing keys indexed by their `kid` header.
+    Key material (HMAC secrets or PEM encoded RSA/EC keys) is parsed into key objects once, when the keyring is
+    built, so verifying a token is a dict lookup plus one signature check no matter how many keys are active.
+    New tokens are signed with `active_kid`; the other keys only verify tokens issued before a rotation.
+    Tokens without a `kid` header (issued before key rotation was introduced) are checked against DEFAULT_KID.
+    """
+
+    def __init__(self, keys: Mapping[str, str], algorithm: str, active_kid: Optional[str] = None):
+        self.algorithm = algorithm
+        self.keys: dict[str, Key] = {kid: jwk.construct(material, algorithm) for kid, material in keys.items()}
+        # Asymmetric keys verify with their public half, derived here once as well
+        self._verifying_keys = {
+            kid: key.public_key() if hasattr(key, "is_public") and not key.is_public() else key
+            for kid, key in self.keys.items()
+        }
+        if active_kid is None and len(self.keys) == 1:
+            active_kid = next(iter(self.keys))
+        if active_kid is None and self.keys:
+            raise ValueError("JWT_ACTIVE_KID must be set when more than one signing key is configured")
+        if active_kid is not None and active_kid not in self.keys:
+            raise ValueError(f"JWT_ACTIVE_KID '{active_kid}' is not one of the configured signing keys")
+        self.active_kid = active_kid
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        """Builds the keyring from JWT_KEYS, plus SECRET_KEY as DEFAULT_KID when it is set."""
+        keys = dict(settings.JWT_KEYS)
+        if settings.SECRET_KEY:
+            keys.setdefault(DEFAULT_KID, settings.SECRET_KEY)
+        return cls(keys, settings.ALGORITHM, settings.JWT_ACTIVE_KID)
+
+    def sign(self, claims: dict[str, Any]) -> str:
+        if self.active_kid is None:
+            raise RuntimeError("No JWT signing key configured, set SECRET_KEY or JWT_KEYS")
+        return jwt.encode(
+            claims, self.keys[self.active_kid], algorithm=self.algorithm, headers={"kid": self.active_kid}
+        )
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Raises JWTError if the token is invalid or signed with an unknown key."""
+        kid = jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+        key = self._verifying_keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key '{kid}'")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+
+keyring = KeyRing.from_settings()
+
+
+def reload_keyring() -> None:
+    """Rebuilds the keyring from settings after a key rotation and drops the cached claims of verified tokens."""
+    global keyring
+    keyring = KeyRing.from_settings()
+    token_cache.clear()
+
+
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     """
-    Creates a JWT access token.
+    Creates a JWT access token signed with the active key of the keyring.
     Subject is typically the user ID.
     """
     if expires_delta:
@@ -33,13 +150,29 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
         # Default expiry from settings
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject)}  # 'sub' is standard for subject
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return keyring.sign(to_encode)
+
+
+# Claims of already verified tokens, keyed by the token's SHA-256 digest
+token_cache: TTLCache[bytes, dict] = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
 
 
 def decode_access_token(token: str) -> dict:
     """
     Decodes a JWT access token.
     Raises JWTError if token is invalid.
+    Verified claims are cached (see `token_cache`) until the token's `exp` at the latest, so clients reusing
+    a token skip the signature check. Use `invalidate_access_token`, or `token_cache.clear()` on key rotation,
+    to drop them.
     """
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is None:
+        claims = keyring.verify(token)
+        token_cache.set(key, claims, expires_at=claims.get("exp"))
+    return dict(claims)
+
+
+def invalidate_access_token(token: str) -> None:
+    """Drops a token's cached claims (e.g. on logout), so the next decode verifies it again."""
+    token_cache.delete(hashlib.sha256(token.encode()).digest())
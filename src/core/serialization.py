@@ -0,0 +1,78 @@
+import json
+from functools import partial
+from typing import Any, Callable, Literal
+
+from fastapi.responses import ORJSONResponse
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+JsonBackend = Literal["auto", "orjson", "msgspec", "stdlib"]
+
+
+def resolve_json_backend(backend: JsonBackend) -> Literal["orjson", "msgspec", "stdlib"]:
+    """
+    Resolves the configured JSON backend to a concrete one.
+    "auto" picks the fastest installed library, falling back to the standard library.
+    """
+    if backend != "auto":
+        if (backend == "orjson" and orjson is None) or (backend == "msgspec" and msgspec is None):
+            raise RuntimeError(f"JSON_SERIALIZER is '{backend}' but the `{backend}` package is not installed")
+        return backend
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "stdlib"
+
+
+class MsgspecResponse(JSONResponse):
+    """JSON response rendered with msgspec (requires `msgspec` to be installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def get_response_class(backend: JsonBackend) -> type[JSONResponse]:
+    """Returns the JSON response class to use as the application's default response class."""
+    return {
+        "orjson": ORJSONResponse,
+        "msgspec": MsgspecResponse,
+        "stdlib": JSONResponse,
+    }[resolve_json_backend(backend)]
+
+
+def get_json_dumps(backend: JsonBackend) -> Callable[[Any], bytes]:
+    """Returns a function that encodes a JSON compatible object to compact UTF-8 JSON bytes."""
+    match resolve_json_backend(backend):
+        case "orjson":
+            return partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+        case "msgspec":
+            return msgspec.json.encode
+        case _:
+            return lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def get_json_log_formatter(backend: JsonBackend) -> dict[str, Any]:
+    """
+    Returns the backend specific part of the JSON log formatter config for logging.config.dictConfig.
+    """
+    match resolve_json_backend(backend):
+        case "orjson":
+            return {"()": "pythonjsonlogger.orjson.OrjsonFormatter"}
+        case "msgspec":
+            return {"()": "pythonjsonlogger.msgspec.MsgspecFormatter"}
+        case _:
+            return {
+                "()": "pythonjsonlogger.json.JsonFormatter",
+                "json_ensure_ascii": False,
+                "json_serializer": json.dumps,
+            }
@@ -0,0 +1,313 @@
+# app/core/tracing.py
+
+import atexit
+import json
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Iterator, Literal, Optional, Protocol, Sequence
+
+import httpx
+
+from src.core.config import settings
+
+tracing_logger = logging.getLogger("tracing")
+
+SpanKind = Literal["internal", "server", "client"]
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """
+    Identifiers of the work in progress: the request it belongs to and the current span of its trace
+    (None only for a trace whose root span has not started yet).
+    """
+
+    trace_id: str
+    span_id: Optional[str]
+    request_id: Optional[str] = None
+    correlation_id: Optional[str] = None
+    sampled: bool = True
+
+    @property
+    def traceparent(self) -> str:
+        """W3C `traceparent` header value, to propagate the trace to outbound calls."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceContext]:
+    """Parses a W3C `traceparent` header, returning None if it is missing or invalid."""
+    match = _TRACEPARENT.match(value.strip().lower()) if value else None
+    if match is None or match[1] == _INVALID_TRACE_ID or match[2] == _INVALID_SPAN_ID:
+        return None
+    return TraceContext(trace_id=match[1], span_id=match[2], sampled=bool(int(match[3], 16) & 1))
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+_current_context: ContextVar[Optional[TraceContext]] = ContextVar("trace_context", default=None)
+
+
+def current_context() -> Optional[TraceContext]:
+    return _current_context.get()
+
+
+def outbound_headers() -> dict[str, str]:
+    """Headers that carry the current trace and request id to an outbound HTTP call."""
+    context = _current_context.get()
+    if context is None:
+        return {}
+    headers = {"traceparent": context.traceparent}
+    if context.request_id is not None:
+        headers["x-request-id"] = context.request_id
+    return headers
+
+
+@dataclass
+class Span:
+    name: str
+    kind: SpanKind
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    start_time_ns: int
+    end_time_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: bool = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in `spans`, e.g. for tests."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class FileSpanExporter:
+    """Appends finished spans to `path` as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(asdict(span), default=str) + "\n" for span in spans)
+
+
+class OTLPSpanExporter:
+    """Sends finished spans to an OpenTelemetry collector with OTLP over HTTP (JSON encoding)."""
+
+    _KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(self, endpoint: str, headers: Optional[dict[str, str]] = None, service_name: str = "app"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.client = httpx.Client(headers=headers, timeout=10.0)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        response = self.client.post(self.endpoint, json=self.payload(spans))
+        response.raise_for_status()
+
+    def payload(self, spans: Sequence[Span]) -> dict[str, Any]:
+        resource = {"attributes": self._attributes({"service.name": self.service_name})}
+        otlp_spans = [
+            {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_span_id or "",
+                "name": span.name,
+                "kind": self._KINDS[span.kind],
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.end_time_ns),
+                "attributes": self._attributes(span.attributes),
+                "status": {"code": 2 if span.error else 1},
+            }
+            for span in spans
+        ]
+        scope_spans = [{"scope": {"name": "app"}, "spans": otlp_spans}]
+        return {"resourceSpans": [{"resource": resource, "scopeSpans": scope_spans}]}
+
+    @staticmethod
+    def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+        def value(v: Any) -> dict[str, Any]:
+            if isinstance(v, bool):
+                return {"boolValue": v}
+            if isinstance(v, int):
+                return {"intValue": str(v)}
+            if isinstance(v, float):
+                return {"doubleValue": v}
+            return {"stringValue": str(v)}
+
+        return [{"key": key, "value": value(v)} for key, v in attributes.items()]
+
+
+class BatchSpanExporter:
+    """
+    Hands finished spans to a background thread that exports them in batches, so that slow exports
+    (disk, network) never block the event loop. Spans are dropped (and counted) when the queue is full.
+    """
+
+    def __init__(self, exporter: SpanExporter, max_queue_size: int = 2048, batch_size: int = 256):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue[Optional[Span]] = queue.Queue(max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Exports the queued spans and stops the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            spans = [span for span in batch if span is not None]
+            if spans:
+                try:
+                    self.exporter.export(spans)
+                except Exception:
+                    tracing_logger.exception(f"Could not export {len(spans)} spans")
+            if len(spans) < len(batch):
+                break
+
+
+class Tracer:
+    """
+    Creates spans in the current trace context and hands the finished ones of sampled traces to `exporter`.
+    Without an exporter, spans still give log records their trace and span ids but are not kept.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(
+        self, name: str, kind: SpanKind = "internal", parent: Optional[TraceContext] = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """
+        Runs the block in a new span, a child of `parent` (by default the current span) or the root of a new trace.
+        The yielded span can be renamed or given attributes until the block exits.
+        """
+        parent = parent or _current_context.get()
+        context = (
+            replace(parent, span_id=new_span_id())
+            if parent is not None
+            else TraceContext(trace_id=new_trace_id(), span_id=new_span_id())
+        )
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=context.trace_id,
+            span_id=context.span_id,
+            parent_span_id=parent and parent.span_id,
+            start_time_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_context.set(context)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = True
+            span.attributes["exception.type"] = type(e).__name__
+            raise
+        finally:
+            _current_context.reset(token)
+            span.end_time_ns = time.time_ns()
+            if self.exporter is not None and context.sampled:
+                self.exporter.export([span])
+
+    def record(self, name: str, duration: float, kind: SpanKind = "client", **attributes: Any) -> None:
+        """Records a child of the current span that just finished after `duration` seconds (e.g. from events)."""
+        parent = _current_context.get()
+        if self.exporter is None or parent is None or not parent.sampled:
+            return
+        end_time_ns = time.time_ns()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id,
+            span_id=new_span_id(),
+            parent_span_id=parent.span_id,
+            start_time_ns=end_time_ns - int(duration * 1e9),
+            end_time_ns=end_time_ns,
+            attributes=attributes,
+        )
+        self.exporter.export([span])
+
+
+def build_span_exporter() -> Optional[SpanExporter]:
+    """Creates the exporter selected by TRACING_EXPORTER."""
+    match settings.TRACING_EXPORTER:
+        case "memory":
+            return InMemorySpanExporter()
+        case "file":
+            return BatchSpanExporter(FileSpanExporter(settings.TRACING_FILE_PATH))
+        case "otlp":
+            return BatchSpanExporter(
+                OTLPSpanExporter(
+                    settings.TRACING_OTLP_ENDPOINT, settings.TRACING_OTLP_HEADERS, service_name=settings.APP_NAME
+                )
+            )
+        case _:
+            return None
+
+
+tracer = Tracer(build_span_exporter())
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds request_id, correlation_id, trace_id and span_id of the current context to every log record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _current_context.get()
+        record.request_id = context.request_id if context else None
+        record.correlation_id = context.correlation_id if context else None
+        record.trace_id = context.trace_id if context else None
+        record.span_id = context.span_id if context else None
+        return True
@@ -1,12 +1,37 @@
 # app/crud/base.py
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeBase  # Your base ORM model class
+from sqlalchemy.orm import DeclarativeBase, make_transient_to_detached  # Your base ORM model class
+
+from src.core.exceptions import InvalidCursorException
+from src.crud.cache import EntityCache
+from src.crud.pagination import CursorPage, coerce_cursor_value, decode_cursor, encode_cursor
+from src.db.uow import after_commit, in_unit_of_work
 
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
+# Evicts every entry of the entity cache, for bulk writes whose ids are not known up front
+ALL = "all"
 CreateSchemaType = TypeVar("CreateSchemaType", bound=Any)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=Any)
 
@@ -15,29 +40,146 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Base class for common CRUD operations.
     T is the SQLAlchemy model, CreateSchemaType and UpdateSchemaType are Pydantic schemas.
+    page_key lists the (unique, indexed) columns used to order keyset pagination in `get_page`.
+    chunk_size is the default number of rows per statement/transaction for the `*_many` bulk operations.
+    max_bind_params caps the bound parameters of a multi-row statement (asyncpg allows at most 32767).
+    Writes commit immediately, unless the session is in a `unit_of_work` block, where they only flush.
+    Once a write is committed, the `write_hooks` are awaited with the model's table name (e.g. to invalidate caches).
+    cache opts the model into a read-through `EntityCache` for `get`; writes evict the entries they touch.
     """
 
-    def __init__(self, model: Type[ModelType]):
+    max_bind_params = 32767
+    write_hooks: ClassVar[List[Callable[[str], Awaitable[None]]]] = []
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        *,
+        page_key: Sequence[str] = ("id",),
+        chunk_size: int = 1000,
+        cache: Optional[EntityCache] = None,
+    ):
         self.model = model
+        self.page_key = tuple(page_key)
+        self.chunk_size = chunk_size
+        self.cache = cache
+
+    async def get(self, db: AsyncSession, obj_id: Any, *, use_replica: Optional[bool] = None) -> Optional[ModelType]:
+        """
+        Retrieve a single object by its ID.
+        use_replica routes the read to a read replica (True) or the primary (False); None uses the session default.
+        With a cache, objects already in the session are returned as is and others are served from the cache.
+        """
+        if self.cache is None:
+            return await self._get(db, obj_id, use_replica)
+
+        identity_key = sa.inspect(self.model).identity_key_from_primary_key([obj_id])
+        if (db_obj := db.sync_session.identity_map.get(identity_key)) is not None:
+            return db_obj
+
+        loaded: Optional[ModelType] = None
 
-    async def get(self, db: AsyncSession, obj_id: Any) -> Optional[ModelType]:
-        """Retrieve a single object by its ID."""
-        result = await db.execute(sa.select(self.model).where(self.model.id == obj_id))
+        async def load() -> Optional[Dict[str, Any]]:
+            nonlocal loaded
+            loaded = await self._get(db, obj_id, use_replica)
+            if loaded is None:
+                return None
+            return {attr.key: getattr(loaded, attr.key) for attr in sa.inspect(self.model).column_attrs}
+
+        values = await self.cache.load(obj_id, load)
+        if loaded is not None or values is None:
+            return loaded
+        # Attach a copy of the cached row to this session without querying it
+        db_obj = self.model(**values)
+        make_transient_to_detached(db_obj)
+        return await db.merge(db_obj, load=False)
+
+    async def _get(self, db: AsyncSession, obj_id: Any, use_replica: Optional[bool]) -> Optional[ModelType]:
+        result = await db.execute(
+            sa.select(self.model).where(self.model.id == obj_id), bind_arguments=self._bind_arguments(use_replica)
+        )
         return result.scalar_one_or_none()
 
+    async def get_many(
+        self, db: AsyncSession, obj_ids: Sequence[Any], *, use_replica: Optional[bool] = None
+    ) -> List[ModelType]:
+        """
+        Retrieve the objects with the given IDs with one `WHERE id IN (...)` query per chunk.
+        Missing IDs are skipped and the order of the result is not defined. See `get` for use_replica.
+        """
+        found: List[ModelType] = []
+        for chunk in self._chunks(list(dict.fromkeys(obj_ids)), None):
+            result = await db.execute(
+                sa.select(self.model).where(self.model.id.in_(chunk)), bind_arguments=self._bind_arguments(use_replica)
+            )
+            found.extend(result.scalars().all())
+        return found
+
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, use_replica: Optional[bool] = None
     ) -> List[ModelType]:
-        """Retrieve multiple objects with pagination."""
-        result = await db.execute(sa.select(self.model).offset(skip).limit(limit))
+        """Retrieve multiple objects with pagination. See `get` for use_replica."""
+        result = await db.execute(
+            sa.select(self.model).offset(skip).limit(limit), bind_arguments=self._bind_arguments(use_replica)
+        )
         return list(result.scalars().all())
 
+    async def get_page(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[ModelType]:
+        """
+        Retrieve a page of objects with keyset (cursor) pagination on `page_key`.
+        Unlike `get_multi`, the cost of a page does not grow with its depth.
+        Pass `next_cursor`/`prev_cursor` of a returned page to move forward/backward.
+        """
+        columns = [getattr(self.model, key) for key in self.page_key]
+        key = columns[0] if len(columns) == 1 else sa.tuple_(*columns)
+        scope = self.model.__tablename__
+
+        stmt = sa.select(self.model)
+        direction = "next"
+        if cursor is not None:
+            values, direction = decode_cursor(scope, cursor)
+            if len(values) != len(columns):
+                raise InvalidCursorException()
+            bounds = [sa.literal(coerce_cursor_value(c, v), c.type) for c, v in zip(columns, values, strict=True)]
+            bound = bounds[0] if len(bounds) == 1 else sa.tuple_(*bounds)
+            stmt = stmt.where(key > bound if direction == "next" else key < bound)
+
+        # Walk backwards by reversing the sort order, then restore ascending order on the page
+        order_by = columns if direction == "next" else [c.desc() for c in columns]
+        result = await db.execute(stmt.order_by(*order_by).limit(limit + 1))
+        rows = list(result.scalars().all())
+        has_more = len(rows) > limit
+        items = rows[:limit]
+        if direction == "prev":
+            items.reverse()
+
+        page = CursorPage(items=items)
+        if items:
+            first = [getattr(items[0], k) for k in self.page_key]
+            last = [getattr(items[-1], k) for k in self.page_key]
+            if (direction == "next" and has_more) or direction == "prev":
+                page.next_cursor = encode_cursor(scope, last, "next")
+            if (direction == "prev" and has_more) or (direction == "next" and cursor is not None):
+                page.prev_cursor = encode_cursor(scope, first, "prev")
+        return page
+
+    async def stream(self, db: AsyncSession, *, yield_per: int = 1000) -> AsyncIterator[ModelType]:
+        """
+        Stream every object ordered by `page_key`, using a server-side cursor that fetches `yield_per` rows at a time.
+        Unlike `get_multi`, the full result is never held in memory.
+        """
+        stmt = sa.select(self.model).order_by(*(getattr(self.model, key) for key in self.page_key))
+        result = await db.stream(stmt.execution_options(yield_per=yield_per))
+        async for obj in result.scalars():
+            yield obj
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new object."""
         db_obj = self.model(**obj_in.model_dump())  # Use model_dump for Pydantic v2
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._commit(db, db_obj)
         return db_obj
 
     async def update(
@@ -59,8 +201,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             setattr(db_obj, field, value)
 
         db.add(db_obj)  # Add to session to mark as dirty
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._commit(db, db_obj)
         return db_obj
 
     async def remove(self, db: AsyncSession, *, obj_id: int) -> Optional[ModelType]:
@@ -70,5 +211,176 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         )
         result = await db.execute(stmt)
         removed_obj = result.scalar_one_or_none()
-        await db.commit()
+        await self._commit(db, evict=[obj_id])
         return removed_obj
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        chunk_size: Optional[int] = None,
+    ) -> List[ModelType]:
+        """
+        Create many objects with one batched INSERT (executemany) and one transaction per chunk.
+        Created objects are returned through RETURNING where the dialect supports it, otherwise an empty list.
+        """
+        returning = db.get_bind().dialect.insert_executemany_returning
+        created: List[ModelType] = []
+        for chunk in self._chunks(objs_in, chunk_size):
+            stmt = sa.insert(self.model)
+            if returning:
+                stmt = stmt.returning(self.model, sort_by_parameter_order=True)
+            result = await db.execute(stmt, [self._dump(obj_in) for obj_in in chunk])
+            if returning:
+                created.extend(result.scalars().all())
+            await self._commit(db, evict=ALL)
+        return created
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        Update many objects by primary key with one batched UPDATE (executemany) and one transaction per chunk.
+        Every dict must contain the primary key, plus the fields to update.
+        """
+        for chunk in self._chunks(objs_in, chunk_size):
+            await db.execute(sa.update(self.model), list(chunk))
+            await self._commit(db, evict=[obj_in["id"] for obj_in in chunk])
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        conflict_key: Sequence[str] = ("id",),
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[ModelType]:
+        """
+        Insert or update many objects with multi-row INSERT ... ON CONFLICT (conflict_key) DO UPDATE.
+        update_fields defaults to every provided field that is not part of conflict_key; when there is nothing to
+        update (e.g. update_fields=[]) the statement uses DO NOTHING and only the newly inserted rows are returned.
+        Chunks are capped so that a statement never binds more than `max_bind_params` parameters.
+        Supported on PostgreSQL and SQLite; one transaction per chunk.
+        """
+        dialect = db.get_bind().dialect
+        insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect.name)
+        if insert is None:
+            raise NotImplementedError(f"upsert_many is not supported on the '{dialect.name}' dialect")
+        if not objs_in:
+            return []
+
+        values = [self._dump(obj_in) for obj_in in objs_in]
+        fields = update_fields if update_fields is not None else [f for f in values[0] if f not in conflict_key]
+        # Multi-row VALUES binds one parameter per column and row
+        chunk_size = min(chunk_size or self.chunk_size, max(1, self.max_bind_params // len(values[0])))
+
+        upserted: List[ModelType] = []
+        for chunk in self._chunks(values, chunk_size):
+            stmt = insert(self.model).values(list(chunk))
+            if fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_key), set_={f: stmt.excluded[f] for f in fields}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_key))
+            if dialect.insert_returning:
+                result = await db.execute(stmt.returning(self.model), execution_options={"populate_existing": True})
+                upserted.extend(result.scalars().all())
+            else:
+                await db.execute(stmt)
+            await self._commit(db, evict=ALL)
+        return upserted
+
+    async def remove_many(
+        self, db: AsyncSession, *, obj_ids: Sequence[Any], chunk_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Remove many objects by ID with one DELETE ... WHERE id IN (...) and one transaction per chunk.
+        Removed objects are returned through RETURNING where the dialect supports it, otherwise an empty list.
+        """
+        returning = db.get_bind().dialect.delete_returning
+        removed: List[ModelType] = []
+        for chunk in self._chunks(obj_ids, chunk_size):
+            stmt = sa.delete(self.model).where(self.model.id.in_(chunk))
+            if returning:
+                result = await db.execute(stmt.returning(self.model))
+                removed.extend(result.scalars().all())
+            else:
+                await db.execute(stmt)
+            await self._commit(db, evict=chunk)
+        return removed
+
+    @classmethod
+    def add_write_hook(cls, hook: Callable[[str], Awaitable[None]]) -> None:
+        """
+        Registers an async callback that is awaited with the table name after every committed write.
+        Registering the same hook again is a no-op, e.g. when the app is created more than once.
+        """
+        if hook not in cls.write_hooks:
+            cls.write_hooks.append(hook)
+
+    async def _commit(
+        self,
+        db: AsyncSession,
+        db_obj: Optional[ModelType] = None,
+        *,
+        evict: Union[Sequence[Any], Literal["all"]] = (),
+    ) -> None:
+        """
+        Commits, or only flushes when the session is in a unit of work.
+        Server defaults are loaded by RETURNING during the flush (see `Base.__mapper_args__`), so a refresh is
+        only needed when the commit expires the object.
+        Write hooks run and the `evict` ids (plus db_obj's) leave the entity cache after the commit, which for a
+        unit of work is at the end of its block.
+        """
+        if in_unit_of_work(db):
+            await db.flush()
+            evicted = self._evict(db_obj, evict)
+            table = self.model.__tablename__
+            after_commit(db, f"write_hooks:{table}", self._run_write_hooks)
+            if evicted:
+                after_commit(db, f"evict:{table}:{evicted}", partial(self._evict_async, evicted))
+            return
+        await db.commit()
+        if db_obj is not None and db.sync_session.expire_on_commit:
+            await db.refresh(db_obj)
+        self._evict(db_obj, evict)
+        await self._run_write_hooks()
+
+    def _evict(self, db_obj: Optional[ModelType], evict: Union[Sequence[Any], Literal["all"]]) -> Any:
+        """Drops entries from the entity cache and returns what was evicted, so it can be repeated after a commit."""
+        if self.cache is None:
+            return ()
+        if evict == ALL:
+            self.cache.clear()
+            return ALL
+        obj_ids = tuple(evict) + ((db_obj.id,) if db_obj is not None else ())
+        for obj_id in obj_ids:
+            self.cache.evict(obj_id)
+        return obj_ids
+
+    async def _evict_async(self, evicted: Any) -> None:
+        self._evict(None, evicted)
+
+    async def _run_write_hooks(self) -> None:
+        for hook in self.write_hooks:
+            await hook(self.model.__tablename__)
+
+    @staticmethod
+    def _bind_arguments(use_replica: Optional[bool]) -> Optional[Dict[str, Any]]:
+        return None if use_replica is None else {"use_replica": use_replica}
+
+    def _chunks(self, items: Sequence[Any], chunk_size: Optional[int]) -> Iterator[Sequence[Any]]:
+        size = chunk_size or self.chunk_size
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    @staticmethod
+    def _dump(obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        return obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
@@ -0,0 +1,81 @@
+# app/crud/cache.py
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.core.cache import TTLCache
+
+# Stored for ids that do not exist (negative caching)
+_NOT_FOUND = object()
+
+
+class EntityCache:
+    """
+    Read-through cache of entity column values by primary key for `CRUDBase.get`.
+    Entries live for `ttl` seconds (`negative_ttl` for ids that were not found) in a `maxsize` bounded LRU.
+    Concurrent loads of the same id are coalesced into one query (single flight).
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60.0, negative_ttl: Optional[float] = None):
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.coalesced = 0
+        self._entries: TTLCache[Hashable, Any] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    async def load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the cached values for `key`, or awaits `loader` (once for all concurrent callers) and caches them."""
+        values = self._entries.get(key)
+        if values is not None:
+            return None if values is _NOT_FOUND else values
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # The caller that was loading got cancelled, load on our own
+                return await loader()
+
+        future = self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            values = await loader()
+        except BaseException as e:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # retrieved by the waiters, if any
+            else:
+                future.cancel()
+            raise
+
+        # Values loaded while the key got evicted may predate the write: hand them out but do not cache them
+        if self._pending.get(key) is future:
+            del self._pending[key]
+            if values is None:
+                self._entries.set(key, _NOT_FOUND, expires_at=time.time() + self.negative_ttl)
+            else:
+                self._entries.set(key, values)
+        future.set_result(values)
+        return values
+
+    def evict(self, key: Hashable) -> None:
+        self._entries.delete(key)
+        self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._pending.clear()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Hit/miss counters, hit ratio and size, e.g. for metrics."""
+        stats = self._entries.snapshot()
+        lookups = stats["hits"] + stats["misses"]
+        return {**stats, "coalesced": self.coalesced, "hit_ratio": stats["hits"] / lookups if lookups else 0.0}
@@ -0,0 +1,73 @@
+# app/crud/loader.py
+
+import asyncio
+from typing import Any, Dict, Generic, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.base import CRUDBase, ModelType
+
+
+class BatchLoader(Generic[ModelType]):
+    """
+    DataLoader-style batching of `CRUDBase.get` for one session.
+    Every `load` made within the same event-loop tick is resolved by a single `get_many` query,
+    and results (including misses) are memoized for the lifetime of the loader.
+    """
+
+    def __init__(self, crud: CRUDBase, db: AsyncSession):
+        self.crud = crud
+        self.db = db
+        self._results: Dict[Any, asyncio.Future] = {}
+        self._queue: List[Any] = []
+
+    async def load(self, obj_id: Any) -> Optional[ModelType]:
+        future = self._results.get(obj_id)
+        if future is None or future.cancelled():
+            loop = asyncio.get_running_loop()
+            future = self._results[obj_id] = loop.create_future()
+            if not self._queue:
+                # Runs once the tasks that are ready in this tick have queued their ids as well
+                loop.call_soon(self._dispatch)
+            self._queue.append(obj_id)
+        # Shielded, so that a cancelled caller doesn't cancel the future shared with the other loads
+        return await asyncio.shield(future)
+
+    async def load_many(self, obj_ids: Sequence[Any]) -> List[Optional[ModelType]]:
+        return list(await asyncio.gather(*(self.load(obj_id) for obj_id in obj_ids)))
+
+    def _dispatch(self) -> None:
+        obj_ids, self._queue = self._queue, []
+        asyncio.get_running_loop().create_task(self._fetch(obj_ids))
+
+    async def _fetch(self, obj_ids: List[Any]) -> None:
+        try:
+            found = {db_obj.id: db_obj for db_obj in await self.crud.get_many(self.db, obj_ids)}
+        except Exception as e:
+            for obj_id in obj_ids:
+                # Forget failures so that a later load retries
+                future = self._results.pop(obj_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                    future.exception()  # retrieved by the awaiting loads, if any
+            return
+        for obj_id in obj_ids:
+            future = self._results.get(obj_id)
+            if future is None or future.cancelled():
+                self._results.pop(obj_id, None)
+            elif not future.done():
+                future.set_result(found.get(obj_id))
+
+
+class Loaders:
+    """Request-scoped registry holding one `BatchLoader` per CRUD object."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._loaders: Dict[int, BatchLoader] = {}
+
+    def __getitem__(self, crud: CRUDBase[ModelType, Any, Any]) -> BatchLoader[ModelType]:
+        loader = self._loaders.get(id(crud))
+        if loader is None:
+            loader = self._loaders[id(crud)] = BatchLoader(crud, self.db)
+        return loader
@@ -0,0 +1,82 @@
+# app/crud/pagination.py
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Generic, List, Literal, Optional, Sequence, Tuple, TypeVar
+
+import sqlalchemy as sa
+
+from src.core.config import settings
+from src.core.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+CursorDirection = Literal["next", "prev"]
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    """A page of results from keyset pagination, with opaque cursors to the neighbouring pages."""
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(scope: str, values: Sequence[Any], direction: CursorDirection) -> str:
+    """
+    Encodes the key values of a boundary row into an opaque, signed cursor.
+    The scope (e.g. the table name) is part of the signature, so cursors can't be replayed against another model.
+    """
+    data = json.dumps({"k": list(values), "d": direction}, separators=(",", ":"), default=str)
+    payload = base64.urlsafe_b64encode(data.encode()).rstrip(b"=")
+    return f"{payload.decode()}.{_sign(scope, payload).decode()}"
+
+
+def decode_cursor(scope: str, cursor: str) -> Tuple[List[Any], CursorDirection]:
+    """
+    Verifies and decodes a cursor created by `encode_cursor`.
+    Raises InvalidCursorException if the cursor is malformed or its signature doesn't match.
+    """
+    try:
+        payload, signature = cursor.encode().rsplit(b".", 1)
+        if not hmac.compare_digest(signature, _sign(scope, payload)):
+            raise ValueError("signature mismatch")
+        data = json.loads(base64.urlsafe_b64decode(payload + b"=" * (-len(payload) % 4)))
+        values, direction = data["k"], data["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorException() from e
+    if not isinstance(values, list) or direction not in ("next", "prev"):
+        raise InvalidCursorException()
+    return values, direction
+
+
+def coerce_cursor_value(column: sa.ColumnElement, value: Any) -> Any:
+    """Converts a JSON decoded cursor value back to the column's Python type (datetime, UUID, Decimal, ...)."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime, date, time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorException() from e
+
+
+# Dedicated cursor signing key, never shared with token signing
+_cursor_key = (settings.CURSOR_SECRET or secrets.token_urlsafe(32)).encode()
+
+
+def _sign(scope: str, payload: bytes) -> bytes:
+    digest = hmac.new(_cursor_key, scope.encode() + b"." + payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=")
@@ -13,6 +13,10 @@ class Base(DeclarativeBase):
 
     type_annotation_map = {datetime: DateTime(timezone=True)}
 
+    # Fetch server generated values (e.g. T_CreatedAt/T_ModifiedAt) with RETURNING as part of the
+    # INSERT/UPDATE itself, instead of a separate refresh() round trip after the flush
+    __mapper_args__ = {"eager_defaults": True}
+
 
 T_CreatedAt = Annotated[
     datetime,
@@ -0,0 +1,113 @@
+# app/db/query_stats.py
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.tracing import tracer
+
+query_logger = logging.getLogger("db.queries")
+
+# A parenthesized group, allowing one level of nested parentheses (e.g. pyformat `%(id_1)s` placeholders)
+_GROUP = r"\((?:[^()]|\([^()]*\))*\)"
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$%:])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(rf"\bIN\s*{_GROUP}", re.IGNORECASE)
+_VALUES_ROWS = re.compile(rf"\b(VALUES\s*{_GROUP})(?:\s*,\s*{_GROUP})+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse_in_list(match: re.Match) -> str:
+    # Keep subqueries, only lists of values vary in length
+    return match.group(0) if "select" in match.group(0).lower() else "IN (...)"
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """
+    Reduces a SQL statement to its shape: literals become `?`, IN lists and multi-row VALUES are collapsed
+    and whitespace is squeezed, so the same query with other values or list lengths normalizes the same.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _IN_LIST.sub(_collapse_in_list, statement)
+    statement = _VALUES_ROWS.sub(r"\1, ...", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryStats:
+    """Queries run while handling one request: how many, how long in total and the slowest one."""
+
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)  # normalized statement -> times run
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run more than `threshold` times, the usual sign of an N+1 query pattern."""
+        return [(statement, n) for statement, n in self.statements.most_common() if n > threshold]
+
+    def summary(self) -> str:
+        text = f"Queries: {self.count} DB: {self.total_time:.4f}s"
+        if self.slowest_statement is not None:
+            text += f" Slowest: {self.slowest_time:.4f}s {self.slowest_statement}"
+        return text
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Records the queries of instrumented engines run in the current context (e.g. a request) in a `QueryStats`."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def instrument_queries(engine: AsyncEngine, slow_query_seconds: float = 0.0) -> None:
+    """
+    Times every statement run on the engine and records it in the current `QueryStats`, if any,
+    and as a span of the current trace.
+    Statements slower than `slow_query_seconds` are logged to "db.queries" (0 disables the slow query log).
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started_at"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info.pop("query_started_at")
+        stats = _current_stats.get()
+        slow = slow_query_seconds and duration >= slow_query_seconds
+        if stats is None and not slow and tracer.exporter is None:
+            return
+        normalized = normalize_statement(statement)
+        if stats is not None:
+            stats.record(normalized, duration)
+        tracer.record("db.query", duration, **{"db.system": conn.dialect.name, "db.statement": normalized})
+        if slow:
+            query_logger.warning(f"Slow query ({duration:.4f}s): {normalized}")
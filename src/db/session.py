@@ -1,14 +1,195 @@
 # app/db/session.py
 
-from typing import AsyncGenerator
+import itertools
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Optional, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Select, event, exc, make_url, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from src.core.config import settings
+from src.core.deadline import remaining_time
+from src.core.metrics import DB_REQUEST_SESSIONS, instrument_pool
+from src.db.query_stats import instrument_queries
+from src.db.uow import unit_of_work
+
+
+def build_engine(database_url: str, node: str = "primary") -> AsyncEngine:
+    """
+    Creates an async engine with the pool and driver tuning from settings.
+    node labels the pool metrics of the engine ("primary" or "replica").
+    Statements are timed for the per-request query stats and the slow query log (see `query_stats`).
+    """
+    url = make_url(database_url)
+    idle_ping = settings.DB_POOL_PRE_PING and settings.DB_POOL_PRE_PING_IDLE_SECONDS > 0
+    kwargs: dict[str, Any] = {
+        # echo=True is good for development to see SQL, set to False in production for performance
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING and not idle_ping,
+    }
+
+    # SQLite (e.g. tests) uses a single connection pool that takes no sizing options
+    if url.get_backend_name() != "sqlite":
+        kwargs |= {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+
+    if url.get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER_MODE:
+            # pgbouncer (transaction pooling) can't keep prepared statements across transactions
+            kwargs["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        else:
+            kwargs["connect_args"] = {
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            }
+
+    engine = create_async_engine(url, **kwargs)
+    if idle_ping:
+        _ping_idle_connections_on_checkout(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    instrument_queries(engine, settings.DB_SLOW_QUERY_SECONDS)
+    if settings.METRICS_ENABLED:
+        instrument_pool(engine, node)
+    return engine
+
+
+def _ping_idle_connections_on_checkout(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Replacement for pool_pre_ping that only pings connections which sat idle in the pool for longer
+    than `idle_seconds`, saving a round trip on every checkout of a recently used connection.
+    """
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries the checkout with a new one
+            raise exc.DisconnectionError() from e
+
+
+class ReplicaSet:
+    """
+    Round-robin load balancing over read replica engines.
+    A replica that fails to connect or drops its connection is taken out of rotation for `retry_after` seconds.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine], retry_after: float = 30.0):
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._counter = itertools.count()
+        for replica in self.engines:
+            event.listen(replica.sync_engine, "handle_error", self._error_handler(replica))
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Returns the next healthy replica, or None if there is none."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            replica = self.engines[next(self._counter) % len(self.engines)]
+            if self._down_until.get(replica, 0.0) <= now:
+                return replica
+        return None
+
+    def is_healthy(self, replica: AsyncEngine) -> bool:
+        return self._down_until.get(replica, 0.0) <= time.monotonic()
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        self._down_until[replica] = time.monotonic() + self.retry_after
+
+    def _error_handler(self, replica: AsyncEngine):
+        def handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(replica)
+
+        return handle_error
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a read replica and everything else to the primary.
+    Reads only go to a replica when asked for, either per statement (`bind_arguments={"use_replica": True}`)
+    or for the whole session (`session.info["use_replica"] = True`, see `get_read_db`).
+    Once the session has written anything (a flush or an INSERT/UPDATE/DELETE statement), it sticks to the primary
+    so it always reads its own writes. Raw `text()` statements always run on the primary but are not seen as writes.
+    A read that fails because its replica went down is retried once on the next healthy replica or the primary.
+    """
+
+    def __init__(self, *args: Any, replicas: Optional[ReplicaSet] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._replica: Optional[AsyncEngine] = None  # replica the last statement was routed to
+
+    def get_bind(self, mapper=None, *, clause=None, use_replica: Optional[bool] = None, **kw) -> Engine:
+        self._replica = None
+        if isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif isinstance(clause, Select) and self.replicas and not self.info.get("wrote"):
+            if use_replica if use_replica is not None else self.info.get("use_replica", False):
+                # A session keeps reading from the same replica for as long as it stays healthy
+                replica = self.info.get("replica")
+                if replica is None or not self.replicas.is_healthy(replica):
+                    replica = self.info["replica"] = self.replicas.choose()
+                if replica is not None:
+                    self._replica = replica
+                    return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def execute(self, *args: Any, **kwargs: Any):
+        return self._with_replica_fallback(super().execute, *args, **kwargs)
+
+    def scalar(self, *args: Any, **kwargs: Any):
+        return self._with_replica_fallback(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args: Any, **kwargs: Any):
+        return self._with_replica_fallback(super().scalars, *args, **kwargs)
+
+    def _with_replica_fallback(self, run, *args: Any, **kwargs: Any):
+        try:
+            return run(*args, **kwargs)
+        except exc.DBAPIError:
+            replica, self._replica = self._replica, None
+            if replica is None or self.replicas.is_healthy(replica) or self.new or self.dirty or self.deleted:
+                raise
+            # The dropped connection leaves the transaction unusable. Nothing was written yet, so roll it back
+            # (this expires the objects loaded so far) and read from the fallback instead.
+            self.rollback()
+            return run(*args, **kwargs)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _mark_session_written(session: RoutingSession, flush_context, instances) -> None:
+    session.info["wrote"] = True
+
 
 # Create async engine for PostgreSQL
-# echo=True is good for development to see SQL, set to False in production for performance
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG, pool_pre_ping=True)
+engine = build_engine(settings.DATABASE_URL)
+
+# Engines for the read replicas, if any
+read_replicas = ReplicaSet(
+    [build_engine(url, node="replica") for url in settings.DATABASE_READ_URLS],
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
+)
 
 # Create an async session maker
 AsyncSessionLocal = async_sessionmaker(
@@ -17,14 +198,106 @@ AsyncSessionLocal = async_sessionmaker(
     bind=engine,  # Bind to the engine
     class_=AsyncSession,  # Use the async session class
     expire_on_commit=False,  # Important: prevents ORM objects from expiring after commit
+    sync_session_class=RoutingSession,  # Route opted-in reads to the read replicas
+    replicas=read_replicas,
 )
 
 
+@dataclass
+class SessionUsage:
+    """
+    Counts request-scoped sessions and how many of them checked out a pooled connection from the primary
+    and from a read replica. Sessions that never used a connection show up as `unused`; a high share of
+    those means the pools can be sized down.
+    """
+
+    sessions: int = 0
+    used_primary: int = 0
+    used_replica: int = 0
+    unused: int = 0
+
+    def record(self, session: AsyncSession) -> None:
+        connected = session.info.get("connected", ())
+        self.sessions += 1
+        self.used_primary += "primary" in connected
+        self.used_replica += "replica" in connected
+        self.unused += not connected
+        for connection in connected or ("none",):
+            DB_REQUEST_SESSIONS.labels(connection).inc()
+
+    def snapshot(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# Usage of the sessions handed out by the request dependencies below
+session_usage = SessionUsage()
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _record_connection(session: RoutingSession, transaction, connection) -> None:
+    node = "primary" if connection.engine is session.bind else "replica"
+    session.info.setdefault("connected", set()).add(node)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_statement_timeout(session: RoutingSession, transaction, connection) -> None:
+    """
+    Bounds the statements of a transaction begun during a request with a deadline by the time it has left,
+    so Postgres stops working on them once the client is gone. SET LOCAL only lasts for the transaction.
+    """
+    remaining = remaining_time()
+    if remaining is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}")
+
+
+@asynccontextmanager
+async def _request_session(**info: Any) -> AsyncIterator[AsyncSession]:
+    """
+    Opens the session for one request and records its usage in `session_usage`.
+    Creating a session does not touch the pool: it checks out a connection when the first statement
+    is executed and returns it when the session closes, so requests that never query (early returns,
+    cache hits, validation errors) never hold a connection.
+    """
+    async with AsyncSessionLocal() as session:
+        session.info.update(info)
+        try:
+            yield session
+        finally:
+            session_usage.record(session)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that provides an asynchronous database session.
     The session is automatically created, yielded, and then closed/rolled back
     after the request is processed, ensuring proper resource management.
+    A pooled connection is only checked out once the first statement is executed.
     """
-    async with AsyncSessionLocal() as session:
+    async with _request_session() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides a session whose reads are load-balanced across the read replicas.
+    Writes still go to the primary, and once the session wrote, its reads do too.
+    Falls back to the primary when no replica is configured or healthy.
+    """
+    async with _request_session(use_replica=True) as session:
+        yield session
+
+
+async def get_uow_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides a session in unit-of-work mode.
+    Every CRUD write made while handling the request is committed once, after the endpoint returns,
+    or rolled back if it raises.
+    """
+    async with _request_session() as session, unit_of_work(session):
+        yield session
+
+
+async def ping(engine: AsyncEngine) -> None:
+    """Health check of a database node: checks out a connection and runs `SELECT 1` on it."""
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
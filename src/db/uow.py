@@ -0,0 +1,45 @@
+# app/db/uow.py
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Groups several CRUD writes into one transaction.
+    Inside the block CRUD methods only flush(); the transaction is committed once on exit
+    and rolled back if an exception is raised. Nested blocks join the outermost one.
+    """
+    if in_unit_of_work(session):
+        yield session
+        return
+
+    session.info["unit_of_work"] = True
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        session.info.pop("unit_of_work", None)
+        callbacks = session.info.pop("after_commit", {})
+
+    for callback in callbacks.values():
+        await callback()
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    """Whether the session is inside a `unit_of_work` block."""
+    return session.info.get("unit_of_work", False)
+
+
+def after_commit(session: AsyncSession, key: str, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Defers `callback` until the current `unit_of_work` block commits; it is dropped if the block rolls back.
+    Callbacks are deduplicated by `key`, so repeated writes within one block run them only once.
+    """
+    session.info.setdefault("after_commit", {})[key] = callback
@@ -1,16 +1,55 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src import routes
-from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.api.caching import response_cache
+from src.api.middleware.compression import CompressionMiddleware
+from src.api.middleware.concurrency import ConcurrencyLimitMiddleware
+from src.api.middleware.deadline import DeadlineMiddleware
+from src.api.middleware.error_handling import ErrorHandlingMiddleware, custom_exception_handler
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
 from src.api.middleware.request_logging import RequestLoggingMiddleware
+from src.api.middleware.tracing import TracingMiddleware
+from src.api.rate_limit import RateLimitMiddleware
 from src.core.config import settings
+from src.core.exceptions import CustomException
+from src.core.health import drain_on_signal, health_checks
 from src.core.logging import setup_logging
+from src.core.metrics import monitor_event_loop_lag
+from src.core.serialization import get_response_class
+from src.crud.base import CRUDBase
+from src.db.session import engine, ping, read_replicas
 
 # setup logging settings
 setup_logging()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Runs the background tasks of the application."""
+    lag_monitor = None
+    if settings.METRICS_ENABLED and settings.METRICS_LOOP_LAG_INTERVAL > 0:
+        lag_monitor = asyncio.create_task(monitor_event_loop_lag(settings.METRICS_LOOP_LAG_INTERVAL))
+    health_monitor = asyncio.create_task(health_checks.monitor())
+    drain_on_signal(health_checks, settings.HEALTH_DRAIN_SECONDS)
+    yield
+    health_checks.start_draining()
+    health_monitor.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await health_monitor
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await lag_monitor
+
+
 def create_app() -> FastAPI:
     """Create FastAPI APP."""
 
@@ -20,9 +59,27 @@ def create_app() -> FastAPI:
         debug=settings.DEBUG,
         description=settings.APP_DESCRIPTION,
         version=settings.APP_VERSION,
+        default_response_class=get_response_class(settings.JSON_SERIALIZER),
+        lifespan=lifespan,
     )
 
+    if settings.PROFILING_ENABLED:
+        # Innermost, so that the profile covers the request handling only
+        app.add_middleware(ProfilingMiddleware)
+
+    if settings.CONCURRENCY_LIMIT_ENABLED:
+        # Inside the rate limit, so that rejected callers never take a slot
+        app.add_middleware(ConcurrencyLimitMiddleware)
+
+    # Around the concurrency limit, so that time spent queueing counts against the deadline
+    app.add_middleware(DeadlineMiddleware)
+
+    if settings.RATE_LIMIT_ENABLED:
+        # Inside ErrorHandlingMiddleware, which turns its rejections into 429 responses
+        app.add_middleware(RateLimitMiddleware)
+
     app.add_middleware(ErrorHandlingMiddleware)
+    app.add_exception_handler(CustomException, custom_exception_handler)
     app.add_middleware(RequestLoggingMiddleware)
 
     app.add_middleware(
@@ -33,8 +90,26 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+
+    if settings.METRICS_ENABLED:
+        # Around the other middlewares, so that it also sees their responses
+        app.add_middleware(MetricsMiddleware)
+
+    # Outermost, so that every log record of the request carries its request and trace ids
+    app.add_middleware(TracingMiddleware)
+
     routes.setup(app)
 
+    # CRUD writes invalidate the cached responses tagged with their table name
+    CRUDBase.add_write_hook(response_cache.invalidate)
+
+    # Readiness needs the primary; reads fall back to it when replicas are down
+    health_checks.register("database", partial(ping, engine))
+    for i, replica in enumerate(read_replicas.engines):
+        health_checks.register(f"replica-{i}", partial(ping, replica), critical=False)
+
     return app
 
 
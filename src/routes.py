@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 
-from src.api import v1 as api_v1
+from src.api import metrics, v1 as api_v1
+from src.core.config import settings
 
 
 def setup(app: FastAPI) -> None:
     """Setup API Routes."""
 
     api_v1.add_routes(app)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router)
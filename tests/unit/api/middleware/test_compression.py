@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from starlette.responses import StreamingResponse
+
+from src.api.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+ROWS = [{"id": i, "name": f"Project {i}", "description": "Lorem ipsum dolor sit amet"} for i in range(100)]
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/large")
+async def large():
+    return Response(b'{"rows": "' + b"x" * 5000 + b'"}', media_type="application/json", headers={"etag": '"v1"'})
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+@app.get("/binary")
+async def binary():
+    return Response(b"\x00" * 5000, media_type="application/octet-stream")
+
+
+@app.get("/stream")
+async def stream():
+    async def body():
+        for i in range(3):
+            yield f'{{"chunk": {i}}}\n'.encode() * 100
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@app.get("/text")
+async def text():
+    return PlainTextResponse("hello " * 1000)
+
+
+async def request(path: str, accept_encoding: str = "gzip") -> tuple[dict[str, str], list[bytes]]:
+    """Calls the app directly, returning the response headers and the body chunks as they were sent."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        # After the request body, block like a client that stays connected
+        return requests.pop() if requests else await asyncio.Future()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+    return headers, [message["body"] for message in messages[1:] if message.get("body")]
+
+
+def test_negotiate_encoding():
+    """The highest q-value wins, ties go to the server's preference, q=0 and unknown encodings are refused."""
+
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, deflate, br", supported) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", supported) == "gzip"
+    assert negotiate_encoding("*", supported) == "zstd"
+    assert negotiate_encoding("*;q=0, gzip;q=0", supported) is None
+    assert negotiate_encoding("deflate", supported) is None
+    assert negotiate_encoding("", supported) is None
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped():
+    """Complete bodies above the threshold are compressed with a matching content length and a weak ETag."""
+
+    headers, chunks = await request("/large")
+    raw = b"".join(chunks)
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"v1"'
+    assert int(headers["content-length"]) == len(raw) < 5000
+    assert gzip.decompress(raw).startswith(b'{"rows": "xxx')
+
+
+@pytest.mark.asyncio
+async def test_small_other_type_and_unaccepted_bodies_are_not_compressed():
+    """Small bodies, media types outside the allowlist and clients without Accept-Encoding get identity."""
+
+    for path, accept_encoding in (("/small", "gzip"), ("/binary", "gzip"), ("/text", "identity")):
+        headers, _ = await request(path, accept_encoding)
+        assert "content-encoding" not in headers
+
+    headers, _ = await request("/text")
+    assert headers["content-encoding"] == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_streaming_bodies_are_compressed_chunk_by_chunk():
+    """Each streamed chunk is flushed so that it decodes on its own, without a content length."""
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    headers, chunks = await request("/stream")
+    decoded = [decompressor.decompress(chunk) for chunk in chunks]
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert decoded[0] == b'{"chunk": 0}\n' * 100
+    assert b"".join(decoded) == b"".join(f'{{"chunk": {i}}}\n'.encode() * 100 for i in range(3))
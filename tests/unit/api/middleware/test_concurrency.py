@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import JSONResponse
+
+from src.api.middleware.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitMiddleware
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.core.exceptions import ServiceOverloadedException
+
+
+def build_limiter(
+    initial_limit: int = 2, min_limit: int = 1, max_limit: int = 4, max_queue: int = 1
+) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=initial_limit,
+        min_limit=min_limit,
+        max_limit=max_limit,
+        latency_target=0.05,
+        queue_timeout=0.05,
+        max_queue=max_queue,
+    )
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_queue_then_get_shed():
+    """Waiters get freed slots in order; they are shed when the queue is full or their deadline passes."""
+
+    limiter = build_limiter()
+    await limiter.acquire()
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceOverloadedException):
+        await limiter.acquire()  # the queue (max 1) is full
+    limiter.release(time.monotonic())  # hands the slot to the waiter
+    await waiter
+    assert limiter.in_flight == 2
+
+    with pytest.raises(ServiceOverloadedException):
+        await limiter.acquire()  # nobody releases within the queue timeout
+    snapshot = limiter.snapshot()
+    assert (snapshot["in_flight"], snapshot["queued"], snapshot["queue_full"], snapshot["timeout"]) == (2, 0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_the_queue_timeout_fires_is_not_leaked(monkeypatch: pytest.MonkeyPatch):
+    """A waiter whose timeout fires in the tick it was handed a slot is admitted, and its slot given back."""
+
+    limiter = build_limiter(initial_limit=1)
+    await limiter.acquire()
+
+    async def handoff_then_timeout(waiter: asyncio.Future, timeout: float) -> None:
+        limiter.release(time.monotonic())  # hands the slot over...
+        assert waiter.done()
+        raise asyncio.TimeoutError  # ...just as the queue timeout fires
+
+    monkeypatch.setattr("src.api.middleware.concurrency.asyncio.wait_for", handoff_then_timeout)
+    await limiter.acquire()
+    assert limiter.in_flight == 1
+
+    limiter.release(time.monotonic())
+    assert limiter.in_flight == 0
+    assert limiter.snapshot()["timeout"] == 0
+
+
+def test_limit_decreases_on_slow_requests_and_grows_on_fast_ones(monkeypatch: pytest.MonkeyPatch):
+    """Slow requests shrink the limit once per burst, fast requests on a busy limiter grow it."""
+
+    now = 100.0
+    monkeypatch.setattr("src.api.middleware.concurrency.time.monotonic", lambda: now)
+    limiter = build_limiter(initial_limit=4, max_limit=10)
+    limiter.in_flight = 3
+
+    limiter.release(admitted_at=now - 1)  # slow
+    limiter.release(admitted_at=now - 1)  # slow, admitted before that decrease
+    assert limiter.limit == pytest.approx(3.6)
+
+    limiter.in_flight = 3
+    limiter.release(admitted_at=now)  # fast and busy
+    assert limiter.limit == pytest.approx(3.6 + 1 / 3.6)
+
+
+async def _app(scope, receive, send):
+    await asyncio.sleep(0.1)
+    await JSONResponse({})(scope, receive, send)
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_503_but_not_critical_paths():
+    """Shed requests get a 503 envelope with Retry-After; critical paths are never limited."""
+
+    limiter = build_limiter(initial_limit=1, min_limit=1, max_queue=0)
+    app = ErrorHandlingMiddleware(ConcurrencyLimitMiddleware(_app, limiter=limiter))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        responses = await asyncio.gather(client.get("/v1/items"), client.get("/v1/items"), client.get("/v1/healthz"))
+
+    assert sorted(r.status_code for r in responses) == [200, 200, 503]
+    shed = next(r for r in responses if r.status_code == 503)
+    assert shed.json()["code"] == "SERVICE_OVERLOADED" and shed.headers["retry-after"] == "1"
+    assert responses[2].status_code == 200
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.api.middleware.deadline import DeadlineMiddleware, RequestTimeout
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.core.config import settings
+from src.core.deadline import remaining_time
+
+app = FastAPI()
+
+
+@app.get("/sleep/{seconds}")
+async def sleep(seconds: float):
+    remaining = remaining_time()
+    await asyncio.sleep(seconds)
+    return {"remaining": remaining}
+
+
+@app.get("/quick", dependencies=[Depends(RequestTimeout(0.05))])
+async def quick():
+    await asyncio.sleep(0.2)
+    return {}
+
+
+@app.get("/own-timeout")
+async def own_timeout():
+    raise TimeoutError()
+
+
+@app.get("/export")
+async def export():
+    async def rows():
+        yield b"started\n"
+        await asyncio.sleep(0.1)
+        yield f"remaining={remaining_time()}\n".encode()
+
+    return StreamingResponse(rows(), media_type="text/plain")
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> AsyncClient:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_SECONDS", 1.0)
+    transport = ASGITransport(app=ErrorHandlingMiddleware(DeadlineMiddleware(app)), raise_app_exceptions=False)
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_handler_is_cancelled_at_the_deadline(client: AsyncClient):
+    """Requests past their deadline get a 504 envelope; the handler sees its remaining budget."""
+
+    async with client:
+        ok = await client.get("/sleep/0")
+        timed_out = await client.get("/sleep/5", headers={"X-Request-Timeout": "0.05"})
+        ignored_header = await client.get("/sleep/0", headers={"X-Request-Timeout": "60"})
+
+    assert 0.9 < ok.json()["remaining"] <= 1.0
+    assert timed_out.status_code == 504
+    assert timed_out.json() == {
+        "detail": "The request did not complete within its deadline.",
+        "code": "REQUEST_TIMEOUT",
+    }
+    # Clients can shorten the deadline, not extend it
+    assert ignored_header.json()["remaining"] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_routes_set_their_own_deadline(client: AsyncClient):
+    """RequestTimeout replaces the default deadline of a route."""
+
+    async with client:
+        response = await client.get("/quick")
+
+    assert response.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_other_timeouts_are_not_mistaken_for_the_deadline(client: AsyncClient):
+    """A TimeoutError raised by the handler itself is an ordinary error."""
+
+    async with client:
+        response = await client.get("/own-timeout")
+
+    assert response.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_streamed_bodies_are_not_cut_at_the_deadline(client: AsyncClient):
+    """Once the response started, the body is streamed to the end, without a statement budget."""
+
+    async with client:
+        response = await client.get("/export", headers={"X-Request-Timeout": "0.05"})
+
+    assert response.status_code == 200
+    assert response.text == "started\nremaining=None\n"
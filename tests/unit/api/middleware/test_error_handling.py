@@ -0,0 +1,60 @@
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import StreamingResponse
+
+from src.api.middleware.error_handling import ErrorHandlingMiddleware
+from src.core.exceptions import UserNotFoundException
+
+
+async def _raise_custom(scope, receive, send):
+    raise UserNotFoundException()
+
+
+async def _raise_unexpected(scope, receive, send):
+    raise RuntimeError("boom")
+
+
+async def _stream(scope, receive, send):
+    async def body():
+        yield b"a"
+        yield b"b"
+
+    await StreamingResponse(body(), media_type="text/plain")(scope, receive, send)
+
+
+def _client(app) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=ErrorHandlingMiddleware(app)), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_custom_exception_envelope():
+    """CustomException is rendered with its status code and the detail/code envelope."""
+
+    async with _client(_raise_custom) as client:
+        response = await client.get("/users/1")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "User not found.", "code": "USER_NOT_FOUND"}
+
+
+@pytest.mark.asyncio
+async def test_unexpected_exception_envelope():
+    """Unhandled exceptions become a generic 500 SERVER_ERROR envelope."""
+
+    async with _client(_raise_unexpected) as client:
+        response = await client.get("/")
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert response.json()["code"] == "SERVER_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_passes_through():
+    """Streaming responses are forwarded untouched."""
+
+    async with _client(_stream) as client:
+        response = await client.get("/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == "ab"
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from src.api.middleware.metrics import MetricsMiddleware
+from tests.conftest import HTTPCLient
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics-test/{item_id}")
+async def read_item(item_id: int):
+    return {"id": item_id}
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_with_route_templates():
+    """Requests are counted per route template and status, not per raw path."""
+
+    route = {"method": "GET", "route": "/metrics-test/{item_id}"}
+    before = _sample("http_requests_total", **route, status="200")
+    before_unmatched = _sample("http_requests_total", method="GET", route="unmatched", status="404")
+    before_observations = _sample("http_request_duration_seconds_count", **route)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for item_id in (1, 2, 3):
+            await client.get(f"/metrics-test/{item_id}")
+        await client.get("/no-such-route")
+
+    assert _sample("http_requests_total", **route, status="200") - before == 3
+    assert _sample("http_requests_total", method="GET", route="unmatched", status="404") - before_unmatched == 1
+    assert _sample("http_request_duration_seconds_count", **route) - before_observations == 3
+    assert _sample("http_requests_in_progress") == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_prometheus_text(http_client: HTTPCLient):
+    """/metrics serves the Prometheus exposition format."""
+
+    await http_client.get("/v1/healthz")
+    response = await http_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/v1/healthz",status="200"}' in response.text
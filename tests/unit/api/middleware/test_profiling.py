@@ -0,0 +1,65 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.config import settings
+
+pytest.importorskip("pyinstrument")
+
+from src.api.middleware.profiling import ProfilingMiddleware  # noqa: E402
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def profiling_settings(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "s3cret")
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_requests_with_the_token_get_their_profile_back(profiling_settings: Path):
+    """The token in the header or query string swaps the response for the profile; other requests pass through."""
+
+    async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as client:
+        by_header = await client.get("/slow", headers={"X-Profile": "s3cret"})
+        by_query = await client.get("/slow", params={"profile": "s3cret"})
+        wrong_token = await client.get("/slow", headers={"X-Profile": "guess"})
+
+    for response in (by_header, by_query):
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert "pyinstrument" in response.text
+    assert wrong_token.json() == {"ok": True}
+    assert not list(profiling_settings.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_are_written_to_the_profile_directory(
+    profiling_settings: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """With a sample rate of 1 every request is profiled to a file and still gets its own response."""
+
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as client:
+        response = await client.get("/slow")
+
+    assert response.json() == {"ok": True}
+    [profile] = profiling_settings.iterdir()
+    assert "-GET-slow-" in profile.name and profile.suffix == ".html"
+    assert "pyinstrument" in profile.read_text()
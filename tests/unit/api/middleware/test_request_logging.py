@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.middleware.request_logging import RequestLoggingMiddleware
+from src.core.config import settings
+from src.db.query_stats import instrument_queries
+from tests.conftest import HTTPCLient
+
+
+@pytest.mark.asyncio
+async def test_request_and_response_are_logged(http_client: HTTPCLient, caplog: pytest.LogCaptureFixture):
+    """Each request emits one request line and one response line with the status code."""
+
+    # "api.requests" does not propagate to the root logger, so attach the capture handler directly
+    request_logger = logging.getLogger("api.requests")
+    request_logger.addHandler(caplog.handler)
+    try:
+        await http_client.get("/v1/healthz")
+    finally:
+        request_logger.removeHandler(caplog.handler)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "api.requests"]
+    assert messages[0] == "Request: GET /v1/healthz from 127.0.0.1"
+    assert messages[1].startswith("Response: GET /v1/healthz Status: 200 Took: ")
+
+
+@pytest.mark.asyncio
+async def test_response_line_carries_query_stats_and_flags_n_plus_one(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    """The response line reports the request's queries and a repeated statement is flagged as a possible N+1."""
+
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 2)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_queries(engine)
+
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/items")
+    async def list_items():
+        async with engine.connect() as conn:
+            return [(await conn.execute(sa.text(f"SELECT {i}"))).scalar() for i in range(3)]
+
+    loggers = [logging.getLogger("api.requests"), logging.getLogger("db.queries")]
+    for logger in loggers:
+        logger.addHandler(caplog.handler)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items")
+    finally:
+        for logger in loggers:
+            logger.removeHandler(caplog.handler)
+        await engine.dispose()
+
+    response_line = next(r.getMessage() for r in caplog.records if r.getMessage().startswith("Response:"))
+    assert "Queries: 3 DB: " in response_line
+    assert response_line.endswith(" SELECT ?")
+    warnings = [r.getMessage() for r in caplog.records if r.name == "db.queries"]
+    assert warnings == ["Possible N+1 query in GET /items: ran 3 times: SELECT ?"]
@@ -0,0 +1,59 @@
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.middleware.tracing import TracingMiddleware
+from src.core import tracing
+from src.core.tracing import InMemorySpanExporter, current_context, parse_traceparent
+from src.db.query_stats import instrument_queries
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.mark.asyncio
+async def test_requests_run_in_a_server_span_continuing_the_callers_trace(mocker: MockerFixture):
+    """The request span continues the incoming traceparent, DB queries are its children and ids are echoed back."""
+
+    exporter = InMemorySpanExporter()
+    mocker.patch.object(tracing.tracer, "exporter", exporter)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_queries(engine)
+
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(sa.text("SELECT 1"))
+        context = current_context()
+        return {"request_id": context.request_id, "correlation_id": context.correlation_id}
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            traced = await client.get("/items/1", headers={"traceparent": TRACEPARENT, "x-request-id": "req-1"})
+            fresh = await client.get("/items/2", headers={"x-request-id": "bad id\n"})
+    finally:
+        await engine.dispose()
+
+    assert traced.json() == {"request_id": "req-1", "correlation_id": "req-1"}
+    assert traced.headers["x-request-id"] == "req-1"
+    query, server = exporter.spans[:2]
+    assert server.name == "GET /items/{item_id}" and server.kind == "server"
+    assert server.attributes["http.status_code"] == 200
+    assert (server.trace_id, server.parent_span_id) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+    assert traced.headers["traceparent"] == f"00-{server.trace_id}-{server.span_id}-01"
+    assert (query.name, query.parent_span_id, query.attributes["db.statement"]) == (
+        "db.query",
+        server.span_id,
+        "SELECT ?",
+    )
+
+    # Invalid ids are replaced and a request without traceparent starts a new trace
+    assert fresh.headers["x-request-id"] != "bad id\n"
+    fresh_server = exporter.spans[-1]
+    assert fresh_server.parent_span_id is None
+    assert parse_traceparent(fresh.headers["traceparent"]).trace_id == fresh_server.trace_id
@@ -0,0 +1,126 @@
+from typing import Optional
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest_asyncio import fixture as async_fixture
+
+from src.api import caching
+from src.api.caching import CachedRoute, InMemoryCacheBackend, RedisCacheBackend, ResponseCache, cache_response
+
+calls = {"items": 0, "me": 0}
+
+router = APIRouter(route_class=CachedRoute)
+
+
+@router.get("/items")
+@cache_response(ttl=30, tags=("items",))
+async def list_items(page: int = 1):
+    calls["items"] += 1
+    return {"page": page, "items": ["a", "b"]}
+
+
+@router.get("/me")
+@cache_response(ttl=30, per_user=True)
+async def me():
+    calls["me"] += 1
+    return {"call": calls["me"]}
+
+
+app = FastAPI()
+app.include_router(router)
+
+
+@async_fixture
+async def client(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(caching, "response_cache", ResponseCache(InMemoryCacheBackend(100)))
+    monkeypatch.setitem(calls, "items", 0)
+    monkeypatch.setitem(calls, "me", 0)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_cached_endpoint_runs_once_per_key(client: AsyncClient):
+    """Identical GETs are served from the cache; other query strings get their own entry."""
+
+    first = await client.get("/items")
+    second = await client.get("/items")
+    await client.get("/items?page=2")
+
+    assert second.json() == first.json() == {"page": 1, "items": ["a", "b"]}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"] == "public, max-age=30"
+    assert second.headers["content-type"] == "application/json"
+    assert calls["items"] == 2
+
+
+@pytest.mark.asyncio
+async def test_matching_if_none_match_gets_304(client: AsyncClient):
+    """A client that already has the current representation gets an empty 304."""
+
+    etag = (await client.get("/items")).headers["etag"]
+
+    response = await client.get("/items", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_invalidating_a_tag_drops_its_entries(client: AsyncClient):
+    """After invalidate(tag) the endpoint runs again."""
+
+    await client.get("/items")
+    await caching.response_cache.invalidate("items")
+    await client.get("/items")
+
+    assert calls["items"] == 2
+
+
+@pytest.mark.asyncio
+async def test_per_user_entries_are_private(client: AsyncClient):
+    """per_user entries are keyed by the caller's credentials and marked private."""
+
+    alice = await client.get("/me", headers={"Authorization": "Bearer alice"})
+    bob = await client.get("/me", headers={"Authorization": "Bearer bob"})
+    alice_again = await client.get("/me", headers={"Authorization": "Bearer alice"})
+
+    assert (alice.json(), bob.json(), alice_again.json()) == ({"call": 1}, {"call": 2}, {"call": 1})
+    assert alice.headers["cache-control"] == "private, max-age=30"
+
+
+class FakeRedis:
+    """Minimal stand-in for the subset of the redis.asyncio client used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.expiry: dict[str, Optional[int]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.data[key], self.expiry[key] = value, ex
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_stores_entries_and_versions():
+    """Entries expire through Redis and tag versions are kept in counters."""
+
+    redis = FakeRedis()
+    backend = RedisCacheBackend(redis)
+
+    await backend.set("key", b"value", ttl=30)
+    await backend.bump_version("items")
+    await backend.bump_version("items")
+
+    assert await backend.get("key") == b"value"
+    assert redis.expiry["response-cache:key"] == 30
+    assert await backend.get_version("items") == 2
+    assert await backend.get_version("other") == 0
@@ -0,0 +1,111 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
+
+from src.api import rate_limit
+from src.api.middleware.error_handling import ErrorHandlingMiddleware, custom_exception_handler
+from src.api.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitMiddleware,
+    RateLimiter,
+    SlidingWindow,
+    TokenBucket,
+)
+from src.core.config import settings
+from src.core.exceptions import CustomException
+
+
+def test_token_bucket_allows_bursts_then_refills():
+    """A full bucket allows `limit` requests at once, then one more per `window / limit` seconds."""
+
+    bucket = TokenBucket(limit=3, window=3.0)
+    state = None
+    results = []
+    for _ in range(4):
+        state, result = bucket.step(state, now=100.0)
+        results.append(result)
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after == pytest.approx(1.0)
+    assert bucket.step(state, now=100.5)[1].allowed is False
+    assert bucket.step(state, now=101.0)[1].allowed is True
+
+
+def test_sliding_window_weighs_the_previous_window():
+    """Requests of the previous window count in proportion to how much of it still overlaps."""
+
+    window = SlidingWindow(limit=4, window=10.0)
+    state = None
+    for _ in range(4):
+        state, result = window.step(state, now=105.0)
+    assert window.step(state, now=109.0)[1].retry_after == pytest.approx(1.0)
+
+    # Halfway through the next window, half of the previous four still count
+    state, first = window.step(state, now=115.0)
+    state, second = window.step(state, now=115.0)
+    state, third = window.step(state, now=115.0)
+    assert (first.allowed, second.allowed, third.allowed) == (True, True, False)
+    assert third.retry_after == pytest.approx(2.5)
+
+    # Two windows later nothing is left
+    assert window.step(state, now=131.0)[1].remaining == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_seen_keys():
+    """The memory backend keeps at most `max_keys` callers."""
+
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    bucket = TokenBucket(limit=1, window=60.0)
+    await backend.hit(bucket, "a")
+    await backend.hit(bucket, "b")
+    assert not (await backend.hit(bucket, "a")).allowed
+    await backend.hit(bucket, "c")  # evicts "b"
+
+    assert list(backend._states) == ["a", "c"]
+    assert (await backend.hit(bucket, "b")).allowed
+
+
+def build_app(backend: InMemoryRateLimitBackend) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, backend=backend)
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_exception_handler(CustomException, custom_exception_handler)
+
+    @app.get("/login", dependencies=[Depends(RateLimiter(1, 60, key="user", backend=backend))])
+    async def login():
+        return {}
+
+    @app.get("/v1/healthz")
+    async def healthz():
+        return {}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_limits_reject_with_429_envelope_and_headers(monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """Endpoint and default limits send RateLimit headers and reject in the error envelope with Retry-After."""
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_REQUESTS", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_WINDOW_SECONDS", 60.0)
+    mocker.patch.object(rate_limit, "decode_access_token", return_value={"sub": "42"})
+    app = build_app(InMemoryRateLimitBackend(max_keys=100))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        allowed = await client.get("/login", headers={"Authorization": "Bearer token"})
+        rejected = await client.get("/login", headers={"Authorization": "Bearer token"})
+        anonymous = await client.get("/login")  # another caller for the endpoint limit
+        over_default = await client.get("/login")  # fourth request of this IP
+        exempt = [await client.get("/v1/healthz") for _ in range(5)]
+
+    assert allowed.status_code == 200
+    assert allowed.headers["ratelimit-limit"] == "1" and allowed.headers["ratelimit-remaining"] == "0"
+    assert rejected.status_code == 429
+    assert rejected.json() == {"detail": "Too many requests, please retry later.", "code": "RATE_LIMITED"}
+    assert int(rejected.headers["retry-after"]) == 60
+    assert anonymous.status_code == 200
+    assert over_default.status_code == 429 and over_default.headers["ratelimit-policy"] == "3;w=60"
+    assert [r.status_code for r in exempt] == [200] * 5
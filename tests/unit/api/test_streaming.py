@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from src.api.streaming import csv_response, ndjson_response
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+
+
+async def rows(count: int):
+    for i in range(count):
+        yield Row(id=i, name=f"row-{i}")
+
+
+app = FastAPI()
+
+
+@app.get("/export.ndjson")
+async def export_ndjson():
+    return ndjson_response(rows(250), batch_size=100)
+
+
+@app.get("/export.csv")
+async def export_csv():
+    return csv_response(rows(3), fields=["id", "name"], filename="rows.csv")
+
+
+@pytest.mark.asyncio
+async def test_ndjson_response_streams_one_document_per_line():
+    """Every row becomes one JSON document on its own line."""
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/export.ndjson")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 250
+    assert json.loads(lines[-1]) == {"id": 249, "name": "row-249"}
+
+
+@pytest.mark.asyncio
+async def test_csv_response_streams_header_and_rows():
+    """The CSV export has a header row followed by one line per row."""
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/export.csv")
+
+    assert response.headers["content-disposition"] == 'attachment; filename="rows.csv"'
+    assert response.text.splitlines() == ["id,name", "0,row-0", "1,row-1", "2,row-2"]
@@ -1,5 +1,7 @@
 import pytest
 
+from src.core.health import health_checks
+from src.db.session import engine
 from tests.conftest import HTTPCLient
 
 
@@ -7,12 +9,37 @@ from tests.conftest import HTTPCLient
 async def test_healthz_endpoint_healthy(http_client: HTTPCLient):
     """Test the /healthz endpoint when all dependencies are healthy."""
 
-    response = await http_client.get("/healthz")
+    response = await http_client.get("/v1/healthz")
 
     assert response.status_code == 200
     assert response.json() == {}
 
 
+@pytest.mark.asyncio
+async def test_readiness_reports_dependencies_and_draining(http_client: HTTPCLient):
+    """Readiness checks the database (once) and fails with 503 while draining."""
+
+    assert (await http_client.get("/v1/healthz/live")).json() == {}
+
+    response = await http_client.get("/v1/healthz/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["database"]["status"] == "up"
+    assert body["checks"]["database"]["latency_ms"] >= 0
+
+    health_checks.start_draining()
+    try:
+        response = await http_client.get("/v1/healthz/ready")
+    finally:
+        health_checks.draining = False
+        # Closes the pooled connection of the check, whose driver thread would outlive the test
+        await engine.dispose()
+    assert response.status_code == 503
+    assert response.json()["status"] == "draining"
+    assert response.json()["checks"] == body["checks"]
+
+
 # import pytest
 # from httpx import AsyncClient
 # from unittest.mock import AsyncMock
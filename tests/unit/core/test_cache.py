@@ -0,0 +1,37 @@
+import time
+
+from src.core.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The cache holds at most maxsize entries and evicts the least recently used one."""
+
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.snapshot() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_ttl_cache_expires_at_the_earliest_deadline():
+    """An entry expires after ttl or at its own expires_at, whichever comes first."""
+
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("soon", 1, expires_at=time.time() - 1)
+    cache.set("later", 2, expires_at=time.time() + 3600)
+
+    assert cache.get("soon") is None
+    assert cache.get("later") == 2
+    assert len(cache) == 1
+
+
+def test_ttl_cache_can_be_disabled():
+    """A zero size or ttl turns the cache into a no-op."""
+
+    cache: TTLCache[str, int] = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+import signal
+
+import pytest
+
+from src.core.health import HealthRegistry, drain_on_signal
+
+
+async def up():
+    pass
+
+
+async def down():
+    raise ConnectionRefusedError()
+
+
+async def hangs():
+    await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_critical_checks_decide_readiness():
+    """Only critical dependencies fail readiness; failures and timeouts are reported with their latency."""
+
+    registry = HealthRegistry(interval=5, timeout=0.05)
+    registry.register("database", up)
+    registry.register("replica-0", down, critical=False)
+    registry.register("search", hangs, critical=False)
+
+    results = await registry.run_checks()
+
+    assert registry.ready
+    assert results["database"].healthy and results["database"].error is None
+    assert results["replica-0"].as_dict()["error"] == "ConnectionRefusedError"
+    assert results["search"].error == "Timed out after 0.05s"
+    assert results["search"].latency >= 0.05
+
+    registry.register("database", down)
+    await registry.run_checks()
+    assert not registry.ready
+
+
+@pytest.mark.asyncio
+async def test_refresh_serves_cached_results_and_coalesces_callers():
+    """A burst of probes runs the checks once, and not again while the results are fresh."""
+
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    registry = HealthRegistry(interval=5, timeout=1)
+    registry.register("database", slow)
+
+    results = await asyncio.gather(*(registry.refresh() for _ in range(20)))
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+    await registry.refresh()
+    assert calls == 1
+
+    registry.max_age = 0
+    await registry.refresh()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_on_signal_fails_readiness_before_shutting_down():
+    """SIGTERM flips readiness right away and reaches the previous handler after the delay."""
+
+    registry = HealthRegistry(interval=5, timeout=1)
+    received = asyncio.Event()
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: received.set())
+    try:
+        drain_on_signal(registry, delay=0.05)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0)
+
+        assert registry.draining and not registry.ready
+        assert not received.is_set()
+        await asyncio.wait_for(received.wait(), 1)
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+@pytest.mark.asyncio
+async def test_drain_on_signal_warns_when_the_loop_handles_the_signal(caplog: pytest.LogCaptureFixture):
+    """Signals handled through `loop.add_signal_handler` can't be delayed, which is logged."""
+
+    registry = HealthRegistry(interval=5, timeout=1)
+    loop = asyncio.get_running_loop()
+    original = signal.getsignal(signal.SIGTERM)
+    loop.add_signal_handler(signal.SIGTERM, lambda: None)
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.core.health"):
+            drain_on_signal(registry, delay=0.05)
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, original)
+
+    assert "SIGTERM is handled by the event loop" in caplog.text
@@ -0,0 +1,47 @@
+import io
+import logging
+import queue
+
+from src.core.logging import BatchStreamHandler, BatchingQueueListener, BoundedQueueHandler
+
+
+def _record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_drop_policy_counts_discarded_records():
+    """With the 'drop' policy new records are discarded once the queue is full."""
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow_policy="drop")
+    for i in range(5):
+        handler.emit(_record("message %s", i))
+
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["message 0", "message 1"]
+
+
+def test_drop_oldest_policy_keeps_newest_records():
+    """With the 'drop_oldest' policy the oldest queued records make room for new ones."""
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow_policy="drop_oldest")
+    for i in range(5):
+        handler.emit(_record("message %s", i))
+
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["message 3", "message 4"]
+
+
+def test_listener_writes_all_records_in_order():
+    """The listener drains the queue in batches and writes every record to the target stream."""
+
+    stream = io.StringIO()
+    q = queue.Queue(maxsize=100)
+    handler = BoundedQueueHandler(q, overflow_policy="block")
+    listener = BatchingQueueListener(q, BatchStreamHandler(stream))
+
+    listener.start()
+    for i in range(50):
+        handler.emit(_record("message %s", i))
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == [f"message {i}" for i in range(50)]
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import time
+from datetime import timedelta
+
+import pytest
+import rsa
+from jose import JWTError, jwk, jwt
+from pytest_mock import MockerFixture
+
+from src.core import security
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.exceptions import PasswordHashingBusyException
+from src.core.security import DEFAULT_KID, KeyRing
+
+
+@pytest.mark.asyncio
+async def test_async_password_helpers_round_trip():
+    """Hashes made off the event loop verify like the synchronous ones."""
+
+    hashed = await security.aget_password_hash("s3cret")
+
+    assert await security.averify_password("s3cret", hashed)
+    assert not await security.averify_password("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_jobs_fail_fast_when_queue_is_full(monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """Once PASSWORD_HASH_MAX_PENDING jobs are in flight, new ones are rejected instead of queued."""
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    mocker.patch.object(security.pwd_context, "hash", side_effect=lambda password: time.sleep(0.1) or "hashed")
+
+    results = await asyncio.gather(*(security.aget_password_hash("pw") for _ in range(3)), return_exceptions=True)
+
+    assert results[:2] == ["hashed", "hashed"]
+    assert isinstance(results[2], PasswordHashingBusyException)
+    assert results[2].headers == {"Retry-After": "1"}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_password_jobs_count_until_they_finish(mocker: MockerFixture):
+    """A job whose caller gave up still counts against PASSWORD_HASH_MAX_PENDING while it runs."""
+
+    started = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def slow_hash(password: str) -> str:
+        loop.call_soon_threadsafe(started.set)
+        time.sleep(0.1)
+        return "hashed"
+
+    mocker.patch.object(security.pwd_context, "hash", side_effect=slow_hash)
+    job = asyncio.create_task(security.aget_password_hash("pw"))
+    await started.wait()
+    job.cancel()
+    await asyncio.sleep(0)
+
+    assert security._pending_password_jobs == 1
+    await asyncio.sleep(0.2)
+    assert security._pending_password_jobs == 0
+
+
+def test_decode_access_token_caches_verified_claims(monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """A reused token is verified once; invalidating it forces a new verification."""
+
+    monkeypatch.setattr(security, "keyring", KeyRing({"k1": "test-secret"}, "HS256"))
+    monkeypatch.setattr(security, "token_cache", TTLCache(maxsize=10, ttl=60))
+    token = security.create_access_token("42")
+    jwt_decode = mocker.spy(security.jwt, "decode")
+
+    assert security.decode_access_token(token)["sub"] == "42"
+    assert security.decode_access_token(token)["sub"] == "42"
+    assert jwt_decode.call_count == 1
+
+    security.invalidate_access_token(token)
+    security.decode_access_token(token)
+    assert jwt_decode.call_count == 2
+    assert security.token_cache.snapshot() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_cached_claims_do_not_outlive_the_token(monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """Cache entries expire at the token's `exp`, even when the cache TTL is longer."""
+
+    monkeypatch.setattr(security, "keyring", KeyRing({"k1": "test-secret"}, "HS256"))
+    monkeypatch.setattr(security, "token_cache", TTLCache(maxsize=10, ttl=3600))
+    token = security.create_access_token("42", expires_delta=timedelta(seconds=60))
+    security.decode_access_token(token)
+
+    mocker.patch("src.core.cache.time.time", return_value=time.time() + 120)
+
+    assert security.token_cache.get(hashlib.sha256(token.encode()).digest()) is None
+
+
+def test_keyring_verifies_tokens_of_retired_keys(monkeypatch: pytest.MonkeyPatch):
+    """After a rotation, new tokens use the active kid and tokens signed with an older key still verify."""
+
+    monkeypatch.setattr(security, "keyring", KeyRing({DEFAULT_KID: "old-secret"}, "HS256"))
+    old_token = security.create_access_token("1")
+    legacy_token = jwt.encode({"sub": "2"}, "old-secret", algorithm="HS256")  # issued without a kid
+
+    monkeypatch.setattr(
+        security, "keyring", KeyRing({DEFAULT_KID: "old-secret", "k2": "new-secret"}, "HS256", active_kid="k2")
+    )
+    new_token = security.create_access_token("3")
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert [security.keyring.verify(t)["sub"] for t in (old_token, legacy_token, new_token)] == ["1", "2", "3"]
+    with pytest.raises(JWTError):
+        security.keyring.verify(jwt.encode({"sub": "4"}, "x", algorithm="HS256", headers={"kid": "unknown"}))
+
+
+def test_keyring_parses_asymmetric_keys_once(mocker: MockerFixture):
+    """RSA keys are parsed when the keyring is built, not on every sign/verify."""
+
+    public_key, private_key = rsa.newkeys(512)
+    ring = KeyRing({"rsa": private_key.save_pkcs1().decode()}, "RS256")
+    construct = mocker.spy(jwk, "construct")
+
+    token = ring.sign({"sub": "42"})
+
+    assert ring.verify(token)["sub"] == "42"
+    assert construct.call_count == 0
+
+
+def test_keyring_requires_an_active_kid_for_several_keys():
+    """With more than one key, which one signs new tokens must be explicit."""
+
+    with pytest.raises(ValueError):
+        KeyRing({"a": "one", "b": "two"}, "HS256")
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.responses import ORJSONResponse
+from starlette.responses import JSONResponse
+
+from src.core.serialization import (
+    MsgspecResponse,
+    get_json_log_formatter,
+    get_response_class,
+    resolve_json_backend,
+)
+
+PAYLOAD = {"id": 1, "name": "Zoë", "tags": ["a", "b"], "nested": {"ok": True, "ratio": 0.5, "none": None}}
+
+
+def test_explicit_backend_is_kept():
+    """Explicit backends are used as configured."""
+
+    assert resolve_json_backend("stdlib") == "stdlib"
+    assert get_response_class("stdlib") is JSONResponse
+    assert get_json_log_formatter("stdlib")["()"] == "pythonjsonlogger.json.JsonFormatter"
+
+
+def test_auto_backend_prefers_installed_library():
+    """'auto' resolves to one of the supported backends."""
+
+    assert resolve_json_backend("auto") in ("orjson", "msgspec", "stdlib")
+
+
+@pytest.mark.parametrize(
+    ("response_class", "module"),
+    [(ORJSONResponse, "orjson"), (MsgspecResponse, "msgspec")],
+)
+def test_fast_responses_render_same_json_as_stdlib(response_class: type[JSONResponse], module: str):
+    """Fast response classes produce the same document as the stdlib JSONResponse."""
+
+    pytest.importorskip(module)
+    import json
+
+    assert json.loads(response_class(PAYLOAD).body) == json.loads(JSONResponse(PAYLOAD).body)
+
+
+def test_explicit_backend_must_be_installed(monkeypatch: pytest.MonkeyPatch):
+    """Configuring a backend that is not installed fails at startup instead of on the first response."""
+
+    monkeypatch.setattr("src.core.serialization.msgspec", None)
+
+    with pytest.raises(RuntimeError):
+        resolve_json_backend("msgspec")
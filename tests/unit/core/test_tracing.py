@@ -0,0 +1,89 @@
+import logging
+from dataclasses import replace
+
+import pytest
+
+from src.core.tracing import (
+    InMemorySpanExporter,
+    OTLPSpanExporter,
+    TraceContextFilter,
+    Tracer,
+    current_context,
+    outbound_headers,
+    parse_traceparent,
+)
+
+
+def test_parse_traceparent():
+    """Valid W3C traceparent headers are parsed; malformed and all-zero ids are rejected."""
+
+    context = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+    assert (context.trace_id, context.span_id, context.sampled) == (
+        "4bf92f3577b34da6a3ce929d0e0e4736",
+        "00f067aa0ba902b7",
+        True,
+    )
+    assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00").sampled is False
+    for invalid in (None, "", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01"):
+        assert parse_traceparent(invalid) is None
+
+
+def test_spans_nest_in_the_current_context():
+    """Child spans share the trace of their parent, restore it on exit and are exported when they end."""
+
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("parent") as parent:
+        with tracer.span("child", key="value") as child:
+            assert current_context().span_id == child.span_id
+            assert outbound_headers()["traceparent"] == f"00-{child.trace_id}-{child.span_id}-01"
+        tracer.record("db.query", 0.001, **{"db.statement": "SELECT ?"})
+        with pytest.raises(ValueError), tracer.span("failing"):
+            raise ValueError()
+        assert current_context().span_id == parent.span_id
+    assert current_context() is None
+
+    child, query, failing, root = exporter.spans
+    assert {span.trace_id for span in exporter.spans} == {parent.trace_id}
+    assert (root.parent_span_id, child.parent_span_id, query.parent_span_id) == (None, root.span_id, root.span_id)
+    assert child.attributes == {"key": "value"} and child.duration >= 0
+    assert failing.error and failing.attributes["exception.type"] == "ValueError"
+
+
+def test_unsampled_traces_are_not_exported():
+    """Spans of a trace the caller did not sample keep their ids but are not exported."""
+
+    exporter = InMemorySpanExporter()
+    parent = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00")
+    with Tracer(exporter).span("request", parent=parent) as span:
+        assert span.trace_id == parent.trace_id
+    assert exporter.spans == []
+
+
+def test_log_filter_adds_the_trace_context():
+    """Log records carry the request, correlation, trace and span ids of the current context, or None."""
+
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+    TraceContextFilter().filter(record)
+    assert (record.request_id, record.trace_id, record.span_id) == (None, None, None)
+
+    parent = parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+    with Tracer().span("request", parent=replace(parent, request_id="req-1")) as span:
+        TraceContextFilter().filter(record)
+    assert (record.request_id, record.trace_id, record.span_id) == ("req-1", parent.trace_id, span.span_id)
+
+
+def test_otlp_payload():
+    """Spans are encoded as OTLP/JSON resource spans."""
+
+    exporter = InMemorySpanExporter()
+    with Tracer(exporter).span("request", kind="server", **{"http.status_code": 200}):
+        pass
+    payload = OTLPSpanExporter("http://collector:4318/v1/traces", service_name="api").payload(exporter.spans)
+
+    [resource_spans] = payload["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "api"}}]
+    [span] = resource_spans["scopeSpans"][0]["spans"]
+    assert span["kind"] == 2 and span["status"] == {"code": 1}
+    assert span["attributes"] == [{"key": "http.status_code", "value": {"intValue": "200"}}]
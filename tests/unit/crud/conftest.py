@@ -0,0 +1,47 @@
+from typing import AsyncGenerator
+
+import sqlalchemy as sa
+from pytest_asyncio import fixture as async_fixture
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.crud.base import CRUDBase
+from src.db.base import Base, T_CreatedAt
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    group: Mapped[int] = mapped_column(sa.Integer, default=0)
+    name: Mapped[str] = mapped_column(sa.String(50))
+    created_at: Mapped[T_CreatedAt]
+
+
+@async_fixture
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Fixture that provides a session on a fresh in-memory SQLite database with an `items` table.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+    await engine.dispose()
+
+
+@async_fixture
+async def seeded_session(db_session: AsyncSession) -> AsyncSession:
+    """Fixture that seeds 25 items (ids 1..25, groups of 10) in the database."""
+    db_session.add_all(Item(id=i, group=i // 10, name=f"item-{i}") for i in range(1, 26))
+    await db_session.commit()
+    return db_session
+
+
+@async_fixture
+async def item_crud() -> CRUDBase:
+    """Fixture that provides a CRUDBase for the test `Item` model."""
+    return CRUDBase(Item)
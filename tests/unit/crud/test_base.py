@@ -0,0 +1,203 @@
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.exceptions import InvalidCursorException
+from src.crud.base import CRUDBase
+from src.db.uow import unit_of_work
+
+
+class ItemCreate(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_get_page_walks_forward_and_backward(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Keyset pagination returns consecutive pages and can navigate back with prev_cursor."""
+
+    first = await item_crud.get_page(seeded_session, limit=10)
+    assert [i.id for i in first.items] == list(range(1, 11))
+    assert first.prev_cursor is None
+
+    second = await item_crud.get_page(seeded_session, cursor=first.next_cursor, limit=10)
+    assert [i.id for i in second.items] == list(range(11, 21))
+
+    last = await item_crud.get_page(seeded_session, cursor=second.next_cursor, limit=10)
+    assert [i.id for i in last.items] == list(range(21, 26))
+    assert last.next_cursor is None
+
+    back = await item_crud.get_page(seeded_session, cursor=last.prev_cursor, limit=10)
+    assert [i.id for i in back.items] == list(range(11, 21))
+
+    back = await item_crud.get_page(seeded_session, cursor=back.prev_cursor, limit=10)
+    assert [i.id for i in back.items] == list(range(1, 11))
+    assert back.prev_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_page_composite_key(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Composite keys are ordered and compared as a row value."""
+
+    crud = CRUDBase(item_crud.model, page_key=("group", "id"))
+
+    first = await crud.get_page(seeded_session, limit=8)
+    second = await crud.get_page(seeded_session, cursor=first.next_cursor, limit=8)
+
+    assert [i.id for i in first.items + second.items] == list(range(1, 17))
+
+
+@pytest.mark.asyncio
+async def test_get_page_rejects_tampered_cursor(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Cursors are signed, so a modified cursor is rejected."""
+
+    page = await item_crud.get_page(seeded_session, limit=10)
+    payload, signature = page.next_cursor.split(".")
+
+    with pytest.raises(InvalidCursorException):
+        await item_crud.get_page(seeded_session, cursor=f"{payload}x.{signature}")
+
+
+@pytest.mark.asyncio
+async def test_create_many_returns_created_objects(db_session: AsyncSession, item_crud: CRUDBase):
+    """Bulk insert is chunked and returns the created rows in input order."""
+
+    created = await item_crud.create_many(
+        db_session, objs_in=[{"id": i, "name": f"item-{i}"} for i in range(1, 8)], chunk_size=3
+    )
+
+    assert [i.id for i in created] == list(range(1, 8))
+    assert len(await item_crud.get_multi(db_session)) == 7
+
+
+@pytest.mark.asyncio
+async def test_update_many_updates_by_primary_key(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Bulk update applies each dict to the row with the matching primary key."""
+
+    await item_crud.update_many(seeded_session, objs_in=[{"id": i, "name": f"renamed-{i}"} for i in (1, 2)])
+    seeded_session.expire_all()
+
+    assert (await item_crud.get(seeded_session, 1)).name == "renamed-1"
+    assert (await item_crud.get(seeded_session, 3)).name == "item-3"
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_inserts_and_updates(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Existing keys are updated and new keys are inserted."""
+
+    upserted = await item_crud.upsert_many(
+        seeded_session, objs_in=[{"id": 25, "name": "updated"}, {"id": 26, "name": "new"}], chunk_size=1
+    )
+
+    assert {(i.id, i.name) for i in upserted} == {(25, "updated"), (26, "new")}
+    assert (await item_crud.get(seeded_session, 25)).name == "updated"
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_without_update_fields_skips_existing_rows(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """With nothing to update, existing rows are left alone and only new rows are returned."""
+
+    upserted = await item_crud.upsert_many(
+        seeded_session, objs_in=[{"id": 25, "name": "ignored"}, {"id": 26, "name": "new"}], update_fields=[]
+    )
+
+    assert [i.id for i in upserted] == [26]
+    assert (await item_crud.get(seeded_session, 25)).name != "ignored"
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_caps_chunks_at_bind_parameter_limit(
+    seeded_session: AsyncSession, item_crud: CRUDBase, monkeypatch: pytest.MonkeyPatch
+):
+    """A chunk never binds more parameters than max_bind_params."""
+
+    monkeypatch.setattr(item_crud, "max_bind_params", 4)
+    statements = []
+    execute = seeded_session.execute
+
+    async def counting_execute(stmt, *args, **kwargs):
+        statements.append(stmt)
+        return await execute(stmt, *args, **kwargs)
+
+    monkeypatch.setattr(seeded_session, "execute", counting_execute)
+    await item_crud.upsert_many(seeded_session, objs_in=[{"id": i, "name": f"n{i}"} for i in range(24, 29)])
+
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_remove_many_returns_removed_objects(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Bulk delete removes every id and returns the removed rows."""
+
+    removed = await item_crud.remove_many(seeded_session, obj_ids=list(range(1, 21)), chunk_size=7)
+
+    assert sorted(i.id for i in removed) == list(range(1, 21))
+    assert [i.id for i in await item_crud.get_multi(seeded_session)] == list(range(21, 26))
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_every_object_in_key_order(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """stream walks the whole table through a server-side cursor."""
+
+    ids = [item.id async for item in item_crud.stream(seeded_session, yield_per=4)]
+
+    assert ids == list(range(1, 26))
+
+
+@pytest.mark.asyncio
+async def test_create_loads_server_defaults_without_refresh(db_session: AsyncSession, item_crud: CRUDBase):
+    """Server defaults are fetched with RETURNING as part of the INSERT."""
+
+    item = await item_crud.create(db_session, obj_in=ItemCreate(id=1, name="item-1"))
+
+    assert "created_at" in item.__dict__
+    assert item.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once(db_session: AsyncSession, item_crud: CRUDBase):
+    """Writes inside a unit of work are only flushed and committed together on exit."""
+
+    async with unit_of_work(db_session):
+        await item_crud.create(db_session, obj_in=ItemCreate(id=1, name="item-1"))
+        await item_crud.create(db_session, obj_in=ItemCreate(id=2, name="item-2"))
+        assert db_session.in_transaction()
+
+    assert not db_session.in_transaction()
+    assert len(await item_crud.get_multi(db_session)) == 2
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(db_session: AsyncSession, item_crud: CRUDBase):
+    """An exception inside the unit of work discards every write made in it."""
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(db_session):
+            await item_crud.create(db_session, obj_in=ItemCreate(id=1, name="item-1"))
+            raise RuntimeError("boom")
+
+    assert await item_crud.get_multi(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_write_hooks_run_after_commit(
+    db_session: AsyncSession, item_crud: CRUDBase, monkeypatch: pytest.MonkeyPatch
+):
+    """Write hooks get the table name after each commit, and once at the end of a unit of work."""
+
+    written = []
+
+    async def hook(table: str) -> None:
+        written.append(table)
+
+    monkeypatch.setattr(CRUDBase, "write_hooks", [])
+    CRUDBase.add_write_hook(hook)
+    CRUDBase.add_write_hook(hook)  # e.g. once per create_app()
+
+    await item_crud.create_many(db_session, objs_in=[{"name": "a"}])
+    async with unit_of_work(db_session):
+        await item_crud.create_many(db_session, objs_in=[{"name": "b"}])
+        await item_crud.create_many(db_session, objs_in=[{"name": "c"}])
+        assert written == ["items"]
+
+    assert written == ["items", "items"]
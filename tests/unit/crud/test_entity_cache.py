@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.base import CRUDBase
+from src.crud.cache import EntityCache
+from src.db.uow import unit_of_work
+
+
+@pytest.fixture
+def cached_crud(item_crud: CRUDBase) -> CRUDBase:
+    return CRUDBase(item_crud.model, cache=EntityCache(maxsize=100, ttl=60))
+
+
+@pytest.mark.asyncio
+async def test_get_reads_through_the_cache(seeded_session: AsyncSession, cached_crud: CRUDBase, mocker: MockerFixture):
+    """Hits (and misses of unknown ids) are served from the cache without a query."""
+
+    execute = mocker.spy(seeded_session, "execute")
+    for _ in range(2):
+        seeded_session.expunge_all()  # as if every call came from a new session
+        item = await cached_crud.get(seeded_session, 5)
+        assert (item.id, item.name) == (5, "item-5")
+        assert await cached_crud.get(seeded_session, 999) is None
+
+    assert execute.call_count == 2
+    assert cached_crud.cache.snapshot() == {"hits": 2, "misses": 2, "size": 2, "coalesced": 0, "hit_ratio": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_writes_evict_cached_entries(seeded_session: AsyncSession, cached_crud: CRUDBase):
+    """update, remove and create drop the entries of the ids they touch."""
+
+    await cached_crud.get(seeded_session, 5)
+    await cached_crud.get(seeded_session, 6)
+    assert await cached_crud.get(seeded_session, 26) is None
+
+    await cached_crud.update(seeded_session, db_obj=await cached_crud.get(seeded_session, 5), obj_in={"name": "new"})
+    await cached_crud.remove(seeded_session, obj_id=6)
+    await cached_crud.create_many(seeded_session, objs_in=[{"id": 26, "name": "created"}])
+    seeded_session.expunge_all()
+
+    assert (await cached_crud.get(seeded_session, 5)).name == "new"
+    assert await cached_crud.get(seeded_session, 6) is None
+    assert (await cached_crud.get(seeded_session, 26)).name == "created"
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_evicts_again_after_commit(seeded_session: AsyncSession, cached_crud: CRUDBase):
+    """An entry re-cached by another reader before the unit of work commits is evicted on commit."""
+
+    async with unit_of_work(seeded_session):
+        await cached_crud.remove(seeded_session, obj_id=7)
+        await cached_crud.cache.load(7, lambda: asyncio.sleep(0, {"id": 7, "name": "stale"}))
+
+    assert await cached_crud.get(seeded_session, 7) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_one_query(
+    seeded_session: AsyncSession, cached_crud: CRUDBase, mocker: MockerFixture
+):
+    """N concurrent gets of the same id issue a single query."""
+
+    execute = mocker.spy(seeded_session, "execute")
+
+    items = await asyncio.gather(*(cached_crud.get(seeded_session, 3) for _ in range(5)))
+
+    assert {item.id for item in items} == {3}
+    assert execute.call_count == 1
+    assert cached_crud.cache.coalesced == 4
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.base import CRUDBase
+from src.crud.loader import Loaders
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_share_one_query(
+    seeded_session: AsyncSession, item_crud: CRUDBase, mocker: MockerFixture
+):
+    """Concurrent loads are resolved by one IN query; unknown ids resolve to None."""
+
+    execute = mocker.spy(seeded_session, "execute")
+    loader = Loaders(seeded_session)[item_crud]
+
+    items = await asyncio.gather(*(loader.load(obj_id) for obj_id in (3, 1, 2, 3, 999)))
+
+    assert [item.id if item else None for item in items] == [3, 1, 2, 3, None]
+    assert execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_loads_are_memoized_per_request(seeded_session: AsyncSession, item_crud: CRUDBase, mocker: MockerFixture):
+    """Ids loaded before are not queried again by the same loaders."""
+
+    loaders = Loaders(seeded_session)
+    await loaders[item_crud].load_many([1, 2])
+    execute = mocker.spy(seeded_session, "execute")
+
+    items = await loaders[item_crud].load_many([2, 1, 4])
+
+    assert [item.id for item in items] == [2, 1, 4]
+    assert execute.call_count == 1
+    assert execute.call_args.args[0].compile().params == {"id_1": [4]}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_does_not_break_the_batch(seeded_session: AsyncSession, item_crud: CRUDBase):
+    """Cancelling one caller leaves the other loads of its batch, and later loads of its id, working."""
+
+    loader = Loaders(seeded_session)[item_crud]
+    cancelled = asyncio.create_task(loader.load(1))
+    others = [asyncio.create_task(loader.load(obj_id)) for obj_id in (1, 2, 3)]
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    items = await asyncio.gather(*others)
+
+    assert cancelled.cancelled()
+    assert [item.id for item in items] == [1, 2, 3]
+    assert (await loader.load(1)).id == 1
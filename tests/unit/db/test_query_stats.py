@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.query_stats import collect_query_stats, instrument_queries, normalize_statement
+
+
+def test_normalize_statement_reduces_statements_to_their_shape():
+    """Literals, IN lists and multi-row VALUES normalize the same whatever their values or length."""
+
+    assert normalize_statement("SELECT *\n  FROM t WHERE id = 42 AND name = 'it''s'") == (
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    )
+    assert normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?)") == normalize_statement(
+        "SELECT * FROM t WHERE id IN (?)"
+    )
+    assert normalize_statement("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == (
+        "SELECT * FROM t WHERE id IN (...)"
+    )
+    assert normalize_statement("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+        "INSERT INTO t (a, b) VALUES ($1, $2), ..."
+    )
+    # Subqueries are kept
+    assert normalize_statement("SELECT * FROM t WHERE id IN (SELECT id FROM u)") == (
+        "SELECT * FROM t WHERE id IN (SELECT id FROM u)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_queries_are_recorded_in_the_current_stats(caplog: pytest.LogCaptureFixture):
+    """Statements run inside `collect_query_stats` are counted per normalized statement; slow ones are logged."""
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_queries(engine, slow_query_seconds=1e-9)
+    # "db.queries" does not propagate to the root logger, so attach the capture handler directly
+    query_logger = logging.getLogger("db.queries")
+    query_logger.addHandler(caplog.handler)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(sa.text("SELECT 0"))  # outside of any request
+            with collect_query_stats() as stats:
+                for i in range(3):
+                    await conn.execute(sa.text(f"SELECT {i}"))
+                await conn.execute(sa.text("SELECT 'x'"))
+    finally:
+        query_logger.removeHandler(caplog.handler)
+        await engine.dispose()
+
+    assert stats.count == 4
+    assert stats.total_time >= stats.slowest_time > 0
+    assert stats.repeated(2) == [("SELECT ?", 4)]
+    assert stats.summary().startswith("Queries: 4 DB: ")
+    assert sum("Slow query" in r.getMessage() for r in caplog.records) == 5
@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+from prometheus_client import REGISTRY
+from pytest_mock import MockerFixture
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.core.config import settings
+from src.core.deadline import Deadline, bind_deadline
+from src.db import session as session_module
+from src.db.session import ReplicaSet, RoutingSession, SessionUsage, build_engine, get_read_db
+
+
+@pytest.mark.asyncio
+async def test_idle_pre_ping_only_pings_idle_connections(monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """Connections are pinged on checkout only after sitting idle longer than the threshold."""
+
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 0.05)
+    engine = build_engine("sqlite+aiosqlite://")
+    do_ping = mocker.patch.object(engine.dialect, "do_ping", return_value=True)
+
+    for _ in range(3):
+        async with engine.connect() as conn:
+            await conn.execute(sa.text("SELECT 1"))
+    assert do_ping.call_count == 0
+
+    await asyncio.sleep(0.06)
+    async with engine.connect() as conn:
+        await conn.execute(sa.text("SELECT 1"))
+    assert do_ping.call_count == 1
+
+    await engine.dispose()
+
+
+async def _node_engines() -> tuple[AsyncEngine, AsyncEngine]:
+    """A primary and a replica database that each hold one row with their own name."""
+    primary = create_async_engine("sqlite+aiosqlite://")
+    replica = create_async_engine("sqlite+aiosqlite://")
+    for db_engine, name in ((primary, "primary"), (replica, "replica")):
+        async with db_engine.begin() as conn:
+            await conn.execute(sa.text("CREATE TABLE nodes (name TEXT)"))
+            await conn.execute(sa.text("INSERT INTO nodes VALUES (:name)"), {"name": name})
+    return primary, replica
+
+
+NODES = sa.table("nodes", sa.column("name"))
+
+
+@pytest.mark.asyncio
+async def test_routing_session_sends_opted_in_reads_to_replica():
+    """Opted-in reads go to the replica until the session writes, then stick to the primary."""
+
+    primary, replica = await _node_engines()
+    query = sa.select(NODES.c.name)
+    session_factory = async_sessionmaker(primary, sync_session_class=RoutingSession, replicas=ReplicaSet([replica]))
+    async with session_factory() as session:
+        assert await session.scalar(query) == "primary"
+        assert await session.scalar(query, bind_arguments={"use_replica": True}) == "replica"
+
+        session.info["use_replica"] = True
+        assert await session.scalar(query) == "replica"
+
+        # Statements that are not DML do not count as writes
+        assert await session.scalar(sa.text("SELECT name FROM nodes")) == "primary"
+        await session.connection()
+        assert await session.scalar(query) == "replica"
+
+        await session.execute(sa.insert(NODES).values(name="written"))
+        assert await session.scalar(query) == "primary"
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_routing_session_retries_read_when_replica_goes_down():
+    """A read on a dropped replica connection is retried on the primary and the session stays usable."""
+
+    primary, replica = await _node_engines()
+
+    @event.listens_for(replica.sync_engine, "handle_error")
+    def _disconnect(context):
+        context.is_disconnect = True
+
+    async with replica.begin() as conn:
+        await conn.execute(sa.text("DROP TABLE nodes"))
+
+    session_factory = async_sessionmaker(primary, sync_session_class=RoutingSession, replicas=ReplicaSet([replica]))
+    async with session_factory() as session:
+        session.info["use_replica"] = True
+        assert await session.scalar(sa.select(NODES.c.name)) == "primary"
+        await session.commit()
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+def test_replica_set_skips_replicas_marked_down():
+    """Replicas are used round-robin, skipping the ones that recently failed."""
+
+    first, second = create_async_engine("sqlite+aiosqlite://"), create_async_engine("sqlite+aiosqlite://")
+    replicas = ReplicaSet([first, second], retry_after=60)
+
+    assert [replicas.choose() for _ in range(4)] == [first, second, first, second]
+
+    replicas.mark_down(first)
+    assert [replicas.choose() for _ in range(2)] == [second, second]
+
+    replicas.mark_down(second)
+    assert replicas.choose() is None
+
+
+@pytest.mark.asyncio
+async def test_request_sessions_record_connection_usage(monkeypatch: pytest.MonkeyPatch):
+    """Sessions are counted by whether they checked out a primary and/or a replica connection."""
+
+    primary, replica = await _node_engines()
+    usage = SessionUsage()
+    monkeypatch.setattr(session_module, "session_usage", usage)
+    monkeypatch.setattr(
+        session_module,
+        "AsyncSessionLocal",
+        async_sessionmaker(primary, sync_session_class=RoutingSession, replicas=ReplicaSet([replica])),
+    )
+
+    for statements in ([], [sa.select(NODES.c.name)], [sa.select(NODES.c.name), sa.insert(NODES).values(name="x")]):
+        dependency = get_read_db()
+        session = await anext(dependency)
+        for statement in statements:
+            await session.execute(statement)
+        await dependency.aclose()
+
+    assert usage.snapshot() == {"sessions": 3, "used_primary": 1, "used_replica": 2, "unused": 1}
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_open_and_checked_out_connections():
+    """The pool gauges follow connects and checkouts of the engine."""
+
+    engine = build_engine("sqlite+aiosqlite://", node="test")
+
+    def sample(name: str) -> float:
+        return REGISTRY.get_sample_value(name, {"node": "test"}) or 0.0
+
+    async with engine.connect() as conn:
+        await conn.execute(sa.text("SELECT 1"))
+        assert (sample("db_pool_connections"), sample("db_pool_checked_out")) == (1, 1)
+    assert (sample("db_pool_connections"), sample("db_pool_checked_out")) == (1, 0)
+
+    await engine.dispose()
+    assert sample("db_pool_connections") == 0
+
+
+@pytest.mark.asyncio
+async def test_transactions_in_a_request_get_the_remaining_budget_as_statement_timeout(mocker: MockerFixture):
+    """Postgres transactions begun under a deadline run SET LOCAL statement_timeout; other databases are skipped."""
+
+    postgres = mocker.Mock(**{"dialect.name": "postgresql"})
+    sqlite = mocker.Mock(**{"dialect.name": "sqlite"})
+    session_module._apply_statement_timeout(None, None, postgres)
+    assert not postgres.exec_driver_sql.called
+
+    async with asyncio.timeout(10) as timeout_scope:
+        loop_time = asyncio.get_running_loop().time()
+        timeout_scope.reschedule(loop_time + 1.5)
+        with bind_deadline(Deadline(timeout_scope, loop_time)):
+            session_module._apply_statement_timeout(None, None, postgres)
+            session_module._apply_statement_timeout(None, None, sqlite)
+
+    [statement] = postgres.exec_driver_sql.call_args.args
+    prefix, _, milliseconds = statement.rpartition(" ")
+    assert prefix == "SET LOCAL statement_timeout =" and 1400 < int(milliseconds) <= 1500
+    assert not sqlite.exec_driver_sql.called